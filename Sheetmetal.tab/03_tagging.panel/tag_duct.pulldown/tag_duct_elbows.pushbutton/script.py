@@ -73,9 +73,6 @@ if fittings.missing_tag_labels:
     output.print_md("## Missing tag label(s); skipped where unavailable: {}".format(
         ", ".join(sorted(fittings.missing_tag_labels))))
 
-dic_ducts = [d for d in ducts if fittings._norm(
-    d.family) in duct_families]
-
 # Tag in a single transaction.
 t = Transaction(doc, "General Tagging")
 t.Start()
@@ -86,10 +83,16 @@ try:
     skipped_by_param = []
     skipped_no_tag_config = []
     auto_removed = []
+    matched_ids = []
 
-    for d in dic_ducts:
+    # Filter and tag in one pass, normalizing each duct's family once.
+    for d in ducts:
         key = fittings._norm(d.family)
-        tag_configs = duct_families.get(key)
+        if key not in duct_families:
+            continue
+        matched_ids.append(d.element.Id)
+
+        tag_configs = duct_families[key]
         if not tag_configs:
             skipped_no_tag_config.append(d)
             continue
@@ -97,7 +100,7 @@ try:
         fittings.update_write_parameter_from_hierarchy(d.element)
 
         removed_count = fittings.delete_skipped_tags_for_element(
-            d, tag_configs)
+            d, tag_configs, key)
         if removed_count:
             auto_removed.append((d, removed_count))
 
@@ -118,7 +121,7 @@ try:
         tagged_this_element = False
         placement_failed_reason = None
         for tag, loc_param in tag_configs:
-            if tag is None or fittings.should_skip_tag(d, tag):
+            if tag is None or fittings.should_skip_tag(d, tag, key):
                 continue
             tag_type_id = fittings._as_int_id(getattr(tag, 'Id', None))
             if tag_type_id is not None and tag_type_id in existing_tag_type_ids:
@@ -187,7 +190,7 @@ except Exception as e:
 
 # Report.
 output.print_md("# Tagged {} new fitting(s) | {} total fittings in view".format(
-    len(needs_tagging), len(dic_ducts)))
+    len(needs_tagging), len(matched_ids)))
 output.print_md("---")
 
 if needs_tagging:
@@ -247,6 +250,6 @@ output.print_md("# Auto removed invalid tags: {}, {}".format(
 output.print_md("# Skipped (no tag family loaded): {}, {}".format(
     len(skipped_no_tag_config), output.linkify([d.element.Id for d in skipped_no_tag_config])))
 output.print_md("# Total: {}, {}".format(
-    len(dic_ducts), output.linkify([d.element.Id for d in dic_ducts])))
+    len(matched_ids), output.linkify(matched_ids)))
 
 print_disclaimer(output)
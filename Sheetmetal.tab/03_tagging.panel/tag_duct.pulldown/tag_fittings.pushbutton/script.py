@@ -9,7 +9,6 @@ the copyright holder."""
 
 # Imports
 # ==================================================
-import traceback
 from pyrevit import DB, revit, script
 output = script.get_output()
 
@@ -22,6 +21,7 @@ try:
     from tagging.revit_tagging_fittings import Fittings
     from Autodesk.Revit.DB import ElementId, Transaction
 except Exception:
+    import traceback
     output.print_md("# Import failed")
     output.print_md("```text\n{}\n```".format(traceback.format_exc()))
     raise
@@ -53,6 +53,7 @@ try:
     Fittings.skip_vertical_movement_on_extensions = SKIP_VERTICAL_ELBOW_EXTENSION_TAGS
     fittings = Fittings(doc=doc, view=view, tagger=tagger)
 except Exception:
+    import traceback
     output.print_md("# Setup failed")
     output.print_md("```text\n{}\n```".format(traceback.format_exc()))
     raise
@@ -106,12 +106,19 @@ DEFAULT_CONNECTOR_RULE = {
 
 MAX_WRAP_INCHES = 24.0
 
+WHITESPACE_PATTERN = re.compile(r'\s+')
+DIGITS_PATTERN = re.compile(r'\d+')
+NUMBER_PATTERN = re.compile(r'[0-9]+(?:\.[0-9]+)?')
+SIZE_PAIR_PATTERN = re.compile(
+    r'([0-9]+(?:\.[0-9]+)?)\s*x\s*([0-9]+(?:\.[0-9]+)?)')
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
 
 def _normalize_text(value):
     if value is None:
         return ''
     text = str(value).strip().lower()
-    return re.sub(r'\s+', ' ', text)
+    return WHITESPACE_PATTERN.sub(' ', text)
 
 
 NORMALIZED_CONNECTOR_RULES = {
@@ -206,7 +213,7 @@ def _parse_positive_int(value):
     except Exception:
         pass
 
-    match = re.search(r'\d+', text)
+    match = DIGITS_PATTERN.search(text)
     if not match:
         return None
 
@@ -271,10 +278,9 @@ def _parse_size_pair(raw_size):
         return None
 
     text = text.replace('×', 'x')
-    match = re.search(
-        r'([0-9]+(?:\.[0-9]+)?)\s*x\s*([0-9]+(?:\.[0-9]+)?)', text)
+    match = SIZE_PAIR_PATTERN.search(text)
     if not match:
-        nums = re.findall(r'[0-9]+(?:\.[0-9]+)?', text)
+        nums = NUMBER_PATTERN.findall(text)
         if len(nums) == 1:
             # Round sizes like 14"ø are treated as diameter x diameter.
             diameter = float(nums[0])
@@ -304,7 +310,7 @@ def _get_param_number(element, param_name, length_double_to_inches=False):
     if value is None:
         return None
 
-    match = re.search(r'[0-9]+(?:\.[0-9]+)?', str(value))
+    match = NUMBER_PATTERN.search(str(value))
     if not match:
         return None
 
@@ -363,7 +369,7 @@ def _should_keep_existing_opening(element):
     if not current_value:
         return False
 
-    tokens = set(re.findall(r'[a-z0-9]+', current_value))
+    tokens = set(TOKEN_PATTERN.findall(current_value))
     return any(marker in tokens for marker in values_to_keep)
 
 
@@ -10,12 +10,7 @@ the copyright holder."""
 # Imports
 # ==================================================
 from pyrevit import DB, forms, revit, script
-from Autodesk.Revit.DB import ElementId, Transaction
-
-try:
-    from System.Collections.Generic import List
-except Exception as e:
-    script.exit()
+from Autodesk.Revit.DB import ElementId, FilteredElementCollector, Transaction
 
 try:
     from tagging.revit_tagging import RevitTagging
@@ -78,7 +73,12 @@ if not selected_ids:
     forms.alert(
         "No elements selected. Please select elements to tag.", exitscript=True)
 
-selected_elements = [doc.GetElement(eid) for eid in selected_ids]
+# Materialize the selection with one collector instead of per-id lookups
+selected_elements = list(
+    FilteredElementCollector(doc, selected_ids)
+    .WhereElementIsNotElementType()
+    .ToElements()
+)
 
 existing_tag_map = tagger.build_existing_tag_family_map(
     selected_elements)
@@ -9,11 +9,10 @@ the copyright holder."""
 
 # Imports
 # ==================================================
-from System.Collections.Generic import List
 from tagging.revit_tagging import RevitTagging
 from config.tag_config import DEFAULT_TAG_SLOT_CANDIDATES, SLOT_LENGTH_LEFT, SLOT_BOD_RIGHT
 from pyrevit import DB, forms, revit, script
-from Autodesk.Revit.DB import ElementId, Transaction
+from Autodesk.Revit.DB import ElementId, FilteredElementCollector, Transaction
 
 # Button info
 # ==================================================
@@ -71,7 +70,12 @@ if not selected_ids:
     forms.alert(
         "No elements selected. Please select elements to tag.", exitscript=True)
 
-selected_elements = [doc.GetElement(eid) for eid in selected_ids]
+# Materialize the selection with one collector instead of per-id lookups
+selected_elements = list(
+    FilteredElementCollector(doc, selected_ids)
+    .WhereElementIsNotElementType()
+    .ToElements()
+)
 existing_tag_map = tagger.build_existing_tag_family_map(
     selected_elements)
 
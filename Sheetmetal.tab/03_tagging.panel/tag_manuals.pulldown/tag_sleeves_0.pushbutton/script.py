@@ -9,7 +9,6 @@ the copyright holder."""
 
 # Imports
 # ==================================================
-from System.Collections.Generic import List
 from tagging.revit_tagging import RevitTagging
 from config.tag_config import DEFAULT_TAG_SLOT_CANDIDATES, SLOT_SIZE_RIGHT, SLOT_BOD_LEFT
 from pyrevit import DB, forms, revit, script
@@ -74,6 +74,10 @@ check_parameters = {
     PYT_NUMBER_FABRICATION,
 }
 
+# Grouping key order and values that exclude an element, built once
+sorted_check_parameters = tuple(sorted(check_parameters))
+empty_vals = {None, "", "**"}
+
 # Main Code
 # ==================================================
 try:
@@ -111,7 +115,6 @@ try:
             param_values[param_name] = value_str
 
             # Skip if empty or in skip_values
-            empty_vals = {None, "", "**"}
             if value_str in empty_vals:
                 skip_element = True
                 break
@@ -123,8 +126,8 @@ try:
             continue
 
         # Group by combination of all parameters (use cleaned values)
-        composite_key = " | ".join(str(param_values[p]).strip(
-        ) if param_values[p] else "" for p in sorted(check_parameters))
+        composite_key = tuple(param_values[p] or ""
+                              for p in sorted_check_parameters)
         if composite_key not in param_groups:
             param_groups[composite_key] = []
         param_groups[composite_key].append(d)
@@ -85,9 +85,8 @@ try:
         output.print_md("- Starting transaction")
 
         output.print_md("- Running number_ordered_runs")
-        for i, duct in enumerate(ordered_ducts):
-            output.print_md(
-                "  - Processing duct {} of {}".format(i + 1, len(ordered_ducts)))
+        output.print_md(
+            "  - Processing {} ducts".format(len(ordered_ducts)))
 
         with revit.Transaction("Number Ordered Duct Runs (Project)"):
             results = numbering.number_ordered_runs(
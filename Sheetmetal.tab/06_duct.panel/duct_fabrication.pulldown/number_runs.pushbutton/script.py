@@ -12,10 +12,11 @@ the copyright holder."""
 from ducts.revit_duct import RevitDuct
 from revit.revit_element import RevitElement
 from constants.print_outputs import print_disclaimer
-from geometry.size import Size
+from geometry.size import get_size
 from pyrevit import revit, script
 from Autodesk.Revit.DB import *
 from config.parameters_registry import *
+from collections import deque
 import re
 
 # Button info
@@ -47,13 +48,13 @@ output = script.get_output()
 
 # Parameters used to read and write item numbers in priority order
 number_value_parameters = [
-    RVT_ITEM_NUMBER.lower(),
-    PYT_NUMBER_FABRICATION.lower(),
+    RVT_ITEM_NUMBER,
+    PYT_NUMBER_FABRICATION,
 ]
 
 # Parameters used only to determine whether numbering should be skipped
 skip_check_parameters = [
-    PYT_SKIP_NUMBER.lower(),
+    PYT_SKIP_NUMBER,
 ]
 
 # Parameters used to determine whether traversal should stop
@@ -67,7 +68,7 @@ match_paramters = {
 }
 
 # Families allowed to be numbered
-number_families = {
+number_families = frozenset({
     "straight",
     "transition",
     "radius elbow",
@@ -81,10 +82,10 @@ number_families = {
     "tdf end cap",
     'reducer',
     'tee',
-}
+})
 
 # Families not allowed to be numbered but allowed to traverse through
-allow_but_not_number = {
+allow_but_not_number = frozenset({
     'manbars',
     'canvas',
     'fire damper - type a',
@@ -96,26 +97,41 @@ allow_but_not_number = {
     'rect volume damper',
     'access door',
     "straight tap"
-}
+})
+
+# Families that can be walked through, numbered or not
+traversable_families = number_families | allow_but_not_number
 
 # Values that indicate to traverse through but not number
-skip_values = {
+skip_values = frozenset({
     0,
     "skip",
     "n/a",
-}
+})
 
 # Values that indicate to stop the run (do not traverse beyond)
-stop_values = {
+stop_values = frozenset({
     "stop",
-}
+})
 
 # Families that need to be numbered after their connected run has been numbered
-store_families = {
+store_families = frozenset({
     'boot tap',
     'straight tap',
     'rec on rnd straight tap',
-}
+})
+
+# Digits embedded in free-form item number values
+digit_pattern = re.compile(r'\d+')
+
+# Per-run caches keyed by element id, cleared before each numbering pass
+item_number_cache = {}
+match_signature_cache = {}
+connected_fittings_cache = {}
+# Wrapper per connected element id, or None when it stops the run
+connected_duct_cache = {}
+family_lower_cache = {}
+skip_value_cache = {}
 
 # Helper Functions
 # ==================================================
@@ -136,7 +152,7 @@ def _size_signature(size_value):
     if not size_str:
         return None
 
-    size_obj = Size(size_str)
+    size_obj = get_size(size_str)
 
     # Round
     if size_obj.in_diameter is not None:
@@ -175,20 +191,42 @@ def sizes_match(filter_size, conn_size):
 
 def get_prioritized_parameters(duct, parameter_names):
     """Return matching parameters in the configured priority order."""
-    params_by_name = {name: [] for name in parameter_names}
-
-    for param in duct.element.Parameters:
-        param_name_lower = param.Definition.Name.strip().lower()
-        if param_name_lower in params_by_name:
-            params_by_name[param_name_lower].append(param)
-
     ordered_params = []
+    params_by_name = None
     for name in parameter_names:
-        ordered_params.extend(params_by_name.get(name, []))
+        # GetParameters keeps duplicates that share the same name
+        found = list(duct.element.GetParameters(name))
+        if not found:
+            # GetParameters is case-sensitive; fall back to a normalized scan
+            if params_by_name is None:
+                params_by_name = _map_parameters_by_name(duct)
+            found = params_by_name.get(name.strip().lower(), [])
+        ordered_params.extend(found)
 
     return ordered_params
 
 
+def _map_parameters_by_name(duct):
+    """Map stripped, lowercased parameter names to their parameters."""
+    params_by_name = {}
+    for param in duct.element.Parameters:
+        key = param.Definition.Name.strip().lower()
+        params_by_name.setdefault(key, []).append(param)
+    return params_by_name
+
+
+def _get_named_parameter_value(duct, parameter_name):
+    """Return the string value of a named parameter, or '' when missing."""
+    try:
+        params = get_prioritized_parameters(duct, [parameter_name])
+        if not params:
+            return ""
+        val = _get_parameter_value(params[0])
+        return str(val) if val else ""
+    except Exception:
+        return ""
+
+
 def get_number_parameters(duct):
     """Return item number parameters in configured read/write priority order."""
     return get_prioritized_parameters(duct, number_value_parameters)
@@ -224,6 +262,17 @@ def _has_control_value(duct, parameter_names, control_values):
 
 def get_item_number(duct):
     """Get the current item number from any of the number parameters."""
+    key = duct.id
+    if key in item_number_cache:
+        return item_number_cache[key]
+
+    result = _read_item_number(duct)
+    item_number_cache[key] = result
+    return result
+
+
+def _read_item_number(duct):
+    """Read the item number from the element, bypassing the cache."""
     if has_skip_value(duct):
         return None
 
@@ -232,6 +281,13 @@ def get_item_number(duct):
         val = _get_parameter_value(param)
 
         if val is not None:
+            # Plain integer strings are the common case; avoid exceptions
+            if not isinstance(val, (int, float)):
+                val_str = str(val).strip()
+                digits = val_str[1:] if val_str.startswith('-') else val_str
+                if digits.isdigit():
+                    return int(val_str)
+
             # Try to convert to int
             try:
                 num_val = int(val) if isinstance(
@@ -239,7 +295,7 @@ def get_item_number(duct):
                 return num_val
             except (ValueError, TypeError):
                 # Try to extract number from string
-                match = re.search(r'\d+', str(val))
+                match = digit_pattern.search(str(val))
                 if match:
                     return int(match.group())
     return None
@@ -247,6 +303,11 @@ def get_item_number(duct):
 
 def set_item_number(duct, number):
     """Set the item number in the first available parameter."""
+    # Drop cached reads so the next lookup sees the new value
+    item_number_cache.pop(duct.id, None)
+    match_signature_cache.pop(duct.id, None)
+    skip_value_cache.pop(duct.id, None)
+
     for param in get_number_parameters(duct):
         if param.IsReadOnly:
             continue
@@ -272,6 +333,10 @@ def set_item_number(duct, number):
 
 def get_connected_fittings(duct, doc, view):
     """Get all immediately connected fittings (only direct connections)."""
+    cached = connected_fittings_cache.get(duct.id)
+    if cached is not None:
+        return cached
+
     connected = []
     for connector in duct.get_connectors():
         if not connector.IsConnected:
@@ -284,42 +349,68 @@ def get_connected_fittings(duct, doc, view):
                 if not isinstance(connected_elem, FabricationPart):
                     continue
                 # Skip the same element
-                if connected_elem.Id == duct.element.Id:
+                elem_id = connected_elem.Id
+                if elem_id == duct.element.Id:
                     continue
-                try:
-                    connected_duct = RevitDuct(doc, view, connected_elem)
-                    # Skip if this duct has a stop value
-                    if has_stop_value(connected_duct):
-                        continue
+                # Reuse the wrapper and stop check from earlier lookups
+                key = elem_id.Value
+                if key in connected_duct_cache:
+                    connected_duct = connected_duct_cache[key]
+                else:
+                    connected_duct = None
+                    try:
+                        candidate = RevitDuct(doc, view, connected_elem)
+                        # Skip if this duct has a stop value
+                        if not has_stop_value(candidate):
+                            connected_duct = candidate
+                    except Exception:
+                        pass
+                    connected_duct_cache[key] = connected_duct
+                if connected_duct is not None:
                     connected.append(connected_duct)
-                except Exception:
-                    continue
+    connected_fittings_cache[duct.id] = connected
     return connected
 
 
+def get_family_lower(duct):
+    """Return the lowercased family name, read once per element per pass."""
+    key = duct.id
+    family_lower = family_lower_cache.get(key)
+    if family_lower is None:
+        family = duct.family
+        family_lower = family.lower() if family else ""
+        family_lower_cache[key] = family_lower
+    return family_lower
+
+
 def is_numberable(duct):
     """Check if a duct can be numbered based on family."""
-    family = duct.family
-    if not family:
-        return False
-    family_lower = family.lower()
-    return family_lower in number_families
+    return get_family_lower(duct) in number_families
 
 
 def is_traversable(duct):
     """Check if we can traverse through this duct (even if not numbering it)."""
-    family = duct.family
-    if not family:
-        return False
-    family_lower = family.lower()
-    return family_lower in allow_but_not_number or is_numberable(duct)
+    return get_family_lower(duct) in traversable_families
+
+
+def can_enter_run(duct):
+    """Check if forward numbering would do anything with this fitting."""
+    family_lower = get_family_lower(duct)
+    return family_lower in store_families or is_traversable(duct)
 
 
 def has_skip_value(duct):
     """Check if duct has a skip value in its number parameter, or is a round boot tap."""
+    key = duct.id
+    if key not in skip_value_cache:
+        skip_value_cache[key] = _read_skip_value(duct)
+    return skip_value_cache[key]
+
+
+def _read_skip_value(duct):
+    """Evaluate the skip rules on the element, bypassing the cache."""
     # Check if this is a round boot tap - skip those always
-    family = duct.family
-    family_lower = family.lower() if family else ""
+    family_lower = get_family_lower(duct)
     if family_lower == "boot tap":
         sig = _size_signature(duct.size)
         if sig is not None and sig[0] == "round":
@@ -338,6 +429,10 @@ def get_match_signature(duct):
     Get the match signature for a duct based on match_parameters.
     Returns a tuple of (family, size, length, angle) for comparison.
     """
+    cached = match_signature_cache.get(duct.id)
+    if cached is not None:
+        return cached
+
     signature = []
 
     # Family
@@ -349,133 +444,14 @@ def get_match_signature(duct):
     signature.append(str(size))
 
     # Length - get from parameter
-    length = ""
-    try:
-        for param in duct.element.Parameters:
-            param_name_lower = param.Definition.Name.strip().lower()
-            if param_name_lower == 'length':
-                val = param.AsString()
-                if val is None:
-                    val = param.AsValueString()
-                if val:
-                    length = str(val)
-                break
-    except Exception:
-        pass
-    signature.append(length)
+    signature.append(_get_named_parameter_value(duct, RVT_LENGTH))
 
     # Angle - get from parameter
-    angle = ""
-    try:
-        for param in duct.element.Parameters:
-            param_name_lower = param.Definition.Name.strip().lower()
-            if param_name_lower == 'angle':
-                val = param.AsString()
-                if val is None:
-                    val = param.AsValueString()
-                if val:
-                    angle = str(val)
-                break
-    except Exception:
-        pass
-    signature.append(angle)
-
-    return tuple(signature)
-
-
-def find_duct_with_number(connected_ducts, target_number):
-    """
-    Find a connected fitting with a specific number.
-    Returns the duct with that number or None if not found.
-    """
-    for duct in connected_ducts:
-        num = get_item_number(duct)
-        if num == target_number:
-            return duct
-    return None
+    signature.append(_get_named_parameter_value(duct, RVT_ANGLE))
 
-
-def follow_number_chain(start_duct, doc, view, visited=None):
-    """
-    Follow the existing number chain from the start fitting.
-    Returns (last_duct_in_chain, last_number_in_chain, visited_in_chain, chain_ducts).
-    """
-    if visited is None:
-        visited = set()
-
-    chain_ducts = []
-    current_duct = start_duct
-    current_number = get_item_number(current_duct)
-
-    if current_number is None:
-        # No number on start fitting
-        return (current_duct, None, visited, chain_ducts)
-
-    visited.add(current_duct.id)
-    chain_ducts.append(current_duct)
-
-    # Follow the chain forward by looking for the next sequential number
-    while True:
-        next_number = current_number + 1
-        connected = get_connected_fittings(current_duct, doc, view)
-
-        # Filter to unvisited and traversable
-        unvisited_traversable = [
-            c for c in connected
-            if c.id not in visited and is_traversable(c)
-        ]
-
-        # Look for the next number in connected fittings
-        next_duct = find_duct_with_number(unvisited_traversable, next_number)
-
-        if next_duct is None:
-            # Chain ends here
-            break
-
-        visited.add(next_duct.id)
-        chain_ducts.append(next_duct)
-        current_duct = next_duct
-        current_number = next_number
-
-    return (current_duct, current_number, visited, chain_ducts)
-
-
-def find_endpoints(start_duct, doc, view, visited=None):
-    """
-    Find all fittings in the run that are true endpoints (only 1 traversable connection total).
-    Returns a list of duct objects that are endpoints.
-    """
-    if visited is None:
-        visited = set()
-
-    endpoints = []
-    all_ducts = []
-    to_process = [start_duct]
-
-    # First, collect all traversable ducts in the run
-    while to_process:
-        duct = to_process.pop(0)
-
-        if duct.id in visited:
-            continue
-        visited.add(duct.id)
-        all_ducts.append(duct)
-
-        # Get all connected fittings
-        connected = get_connected_fittings(duct, doc, view)
-        for conn in connected:
-            if conn.id not in visited and is_traversable(conn):
-                to_process.append(conn)
-
-    # Now find true endpoints (ducts with only 1 traversable connection)
-    for duct in all_ducts:
-        connected = get_connected_fittings(duct, doc, view)
-        traversable_count = sum(1 for c in connected if is_traversable(c))
-
-        if traversable_count == 1:
-            endpoints.append(duct)
-
-    return endpoints
+    signature = tuple(signature)
+    match_signature_cache[duct.id] = signature
+    return signature
 
 
 def find_connected_numbered_element(duct, doc, view):
@@ -485,8 +461,7 @@ def find_connected_numbered_element(duct, doc, view):
     Returns (number, duct) or (None, None) if not found.
     """
     # Check if this is a store_family
-    family = duct.family
-    family_lower = family.lower() if family else ""
+    family_lower = get_family_lower(duct)
     is_store = family_lower in store_families
 
     # Get all connected elements
@@ -512,39 +487,6 @@ def find_connected_numbered_element(duct, doc, view):
     return (None, None)
 
 
-def find_anchor_number(duct, doc, view, visited=None):
-    """
-    Recursively search backwards through connections to find an existing number.
-    Returns (anchor_number, anchor_duct) or (None, None) if no anchor found.
-    """
-    if visited is None:
-        visited = set()
-
-    visited.add(duct.id)
-
-    # Check if this duct has a number
-    current_number = get_item_number(duct)
-    if current_number is not None and current_number > 0:
-        return (current_number, duct)
-
-    # Get connected fittings and search through them
-    connected = get_connected_fittings(duct, doc, view)
-    for conn in connected:
-        if conn.id in visited:
-            continue
-
-        # Only traverse through valid families
-        if not is_traversable(conn):
-            continue
-
-        # Recursively search
-        anchor_num, anchor_duct = find_anchor_number(conn, doc, view, visited)
-        if anchor_num is not None:
-            return (anchor_num, anchor_duct)
-
-    return (None, None)
-
-
 def number_branch_recursive(
     start_duct,
     start_number,
@@ -574,6 +516,7 @@ def number_branch_recursive(
 
     # Get connected elements and process them
     to_process = []
+    queued_ids = set()
     connected = get_connected_fittings(start_duct, doc, view)
     apply_size_filter = True
 
@@ -581,8 +524,7 @@ def number_branch_recursive(
         if conn.id in visited:
             continue
 
-        family = conn.family
-        family_lower = family.lower() if family else ""
+        family_lower = get_family_lower(conn)
 
         # If this is a store_family, always collect as a sub-branch (size may differ)
         if family_lower in store_families:
@@ -602,7 +544,9 @@ def number_branch_recursive(
                     continue
 
         # Only process if numberable or traversable
-        if is_numberable(conn) or is_traversable(conn):
+        if conn.id not in queued_ids and (
+                is_numberable(conn) or is_traversable(conn)):
+            queued_ids.add(conn.id)
             to_process.append(conn)
 
     # After the first hop, do not size-filter deeper traversal
@@ -625,8 +569,7 @@ def number_branch_recursive(
         next_connected = get_connected_fittings(duct, doc, view)
         for next_conn in next_connected:
             if next_conn.id not in visited:
-                family = next_conn.family
-                family_lower = family.lower() if family else ""
+                family_lower = get_family_lower(next_conn)
 
                 # If store_family, add as sub-branch (ignore size filter)
                 if family_lower in store_families:
@@ -635,8 +578,9 @@ def number_branch_recursive(
                         pass
                     else:
                         all_stored_branches.append((next_conn, duct))
-                else:
+                elif next_conn.id not in queued_ids:
                     if is_numberable(next_conn) or is_traversable(next_conn):
+                        queued_ids.add(next_conn.id)
                         to_process.append(next_conn)
 
     return current_number - 1
@@ -680,11 +624,18 @@ def number_run_forward(
                 filtered_connected.append(conn)
         connected = filtered_connected
 
-    to_process = [(conn, start_duct)
-                  for conn in connected if conn.id not in visited]
+    # Each fitting is queued once; the first source found keeps it.
+    # Fittings that can neither be stored nor traversed are never queued.
+    to_process = deque()
+    queued_ids = set()
+    for conn in connected:
+        if conn.id not in visited and conn.id not in queued_ids:
+            queued_ids.add(conn.id)
+            if can_enter_run(conn):
+                to_process.append((conn, start_duct))
 
     while to_process:
-        duct, source_duct = to_process.pop(0)
+        duct, source_duct = to_process.popleft()
 
         if duct.id in visited:
             continue
@@ -692,8 +643,7 @@ def number_run_forward(
         visited.add(duct.id)
 
         # Check if this is a store_family (tap)
-        family = duct.family
-        family_lower = family.lower() if family else ""
+        family_lower = get_family_lower(duct)
 
         if family_lower in store_families:
             # Skip round boot taps - don't even store them
@@ -725,8 +675,10 @@ def number_run_forward(
         # Get next connections
         next_connected = get_connected_fittings(duct, doc, view)
         for conn in next_connected:
-            if conn.id not in visited:
-                to_process.append((conn, duct))
+            if conn.id not in visited and conn.id not in queued_ids:
+                queued_ids.add(conn.id)
+                if can_enter_run(conn):
+                    to_process.append((conn, duct))
 
     return current_number - 1, stored_taps, modified_ducts, len(modified_ducts)
 
@@ -754,10 +706,21 @@ if selected_duct:
         output.print_md(
             "## Selected fitting has a skip value and cannot be numbered")
     else:
+        item_number_cache.clear()
+        match_signature_cache.clear()
+        connected_fittings_cache.clear()
+        connected_duct_cache.clear()
+        family_lower_cache.clear()
+        skip_value_cache.clear()
+
         # Start transaction
         t = Transaction(doc, "Number Duct Run")
         t.Start()
 
+        # Report lines are buffered and written once the transaction closes
+        log_buf = []
+        committed = False
+
         try:
             modified_ducts = []
             start_number = get_item_number(selected_duct)
@@ -795,7 +758,7 @@ if selected_duct:
                     branch_duct, stored_anchor_duct = branches_to_process.pop(0)
 
                     if branch_duct.id in visited and not (
-                        branch_duct.family and branch_duct.family.lower() in store_families
+                        get_family_lower(branch_duct) in store_families
                     ):
                         continue
 
@@ -815,8 +778,8 @@ if selected_duct:
                         last_number + 1) if last_number is not None else (anchor_num + 1)
                     branch_start = round_up_to_nearest_10(base_for_branch)
 
-                    filter_size = branch_duct.size_out if branch_duct.family and branch_duct.family.lower(
-                    ) in store_families else None
+                    filter_size = branch_duct.size_out if get_family_lower(
+                        branch_duct) in store_families else None
 
                     sub_branches = []
 
@@ -843,7 +806,7 @@ if selected_duct:
                     if sub_branches:
                         branches_to_process = sub_branches + branches_to_process
 
-            output.print_md(
+            log_buf.append(
                 "# Total elements: {:03d}, {}".format(
                     len(modified_ducts),
                     output.linkify([d.element.Id for d in modified_ducts])
@@ -854,13 +817,13 @@ if selected_duct:
                     start_num = get_item_number(modified_ducts[0])
                     end_num = get_item_number(modified_ducts[-1])
                     if start_num or end_num:
-                        output.print_md(
+                        log_buf.append(
                             "Start: {} | End: {}".format(start_num, end_num))
                 except Exception:
                     pass
 
-            RevitElement.select_many(uidoc, modified_ducts)
             t.Commit()
+            committed = True
 
         except Exception as e:
             t.RollBack()
@@ -868,6 +831,10 @@ if selected_duct:
             import traceback
             output.print_md("```\n{}\n```".format(traceback.format_exc()))
 
+        if committed:
+            output.print_md("\n\n".join(log_buf))
+            RevitElement.select_many(uidoc, modified_ducts)
+
     # Final print statements
     print_disclaimer(output)
 else:
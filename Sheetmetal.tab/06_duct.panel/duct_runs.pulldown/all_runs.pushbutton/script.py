@@ -58,11 +58,15 @@ else:
     output.print_md("# Run Details")
     output.print_md("---")
 
-    for i, sel in enumerate(all_run_ducts, start=1):
-        length_val = sel.length or 0.0
-        weight_val = sel.weight or 0.0
-        size_val = sel.size or "N/A"
+    # Read each duct property once into parallel columns
+    lengths = [d.length or 0.0 for d in all_run_ducts]
+    weights = [d.weight or 0.0 for d in all_run_ducts]
+    sizes = [d.size or "N/A" for d in all_run_ducts]
+    element_ids = [d.element.Id for d in all_run_ducts]
+    links = [output.linkify(eid) for eid in element_ids]
 
+    rows = zip(links, lengths, weights, sizes)
+    for i, (link, length_val, weight_val, size_val) in enumerate(rows, start=1):
         length_str = "{:06.2f}".format(length_val)
         weight_str = "{:06.2f}".format(weight_val)
 
@@ -72,7 +76,7 @@ else:
         output.print_md(
             '### No: {:03} | ID: {} | Length: {} | Weight {} | lbs/ft: {} | Size: {}'.format(
                 i,
-                output.linkify(sel.element.Id),
+                link,
                 length_str,
                 weight_str,
                 lbs_ft_str,
@@ -80,9 +84,8 @@ else:
             ))
 
     # Total count
-    element_ids = [d.element.Id for d in all_run_ducts]
-    total_length = sum(d.length or 0 for d in all_run_ducts)
-    total_weight = sum(d.weight or 0 for d in all_run_ducts)
+    total_length = sum(lengths)
+    total_weight = sum(weights)
     total_lbs_per_ft = (total_weight / (total_length / 12.0)
                         ) if total_length else 0.0
 
@@ -16,6 +16,7 @@ from constants.print_outputs import print_disclaimer
 from pyrevit import revit, script
 from Autodesk.Revit.DB import *
 from config.parameters_registry import *
+from System.Collections.Generic import List
 
 # Button info
 # ===================================================
@@ -48,7 +49,43 @@ with revit.Transaction("Regenerate Document"):
     doc.Regenerate()
 
 
-def get_host_duct_from_hanger(hanger, ducts_cache):
+def write_weight(element, parameter_names, value):
+    """Write value to the first writable parameter in parameter_names."""
+    for parameter_name in parameter_names:
+        p = element.LookupParameter(parameter_name)
+        if not p or p.IsReadOnly:
+            continue
+
+        try:
+            if p.StorageType == StorageType.Double:
+                p.Set(value)
+            elif p.StorageType == StorageType.String:
+                p.Set(str(round(value, 2)))
+        except Exception:
+            pass
+        return
+
+
+def get_duct_outline(duct):
+    """Read a duct bounding box once and return its Outline, or None."""
+    d_bbox = duct.element.get_BoundingBox(None)
+    if not d_bbox:
+        return None
+    bmin, bmax = d_bbox.Min, d_bbox.Max
+    return Outline(bmin, bmax)
+
+
+def build_duct_outlines(ducts):
+    """Return (duct, Outline) pairs for every duct with a bounding box."""
+    duct_outlines = []
+    for d in ducts:
+        d_outline = get_duct_outline(d)
+        if d_outline:
+            duct_outlines.append((d, d_outline))
+    return duct_outlines
+
+
+def get_host_duct_from_hanger(hanger, duct_outlines):
     """Resolve the duct element for a hanger.
 
     Tries Primary Element parameter first, then falls back to bbox intersection
@@ -56,26 +93,26 @@ def get_host_duct_from_hanger(hanger, ducts_cache):
     """
     ref_param = hanger.LookupParameter("Primary Element")
     if ref_param:
-        ref_id_str = ref_param.AsString()
-        try:
-            ref_id = int(ref_id_str)
-            elem = doc.GetElement(ElementId(ref_id))
+        ref_id = None
+        if ref_param.StorageType == StorageType.ElementId:
+            ref_id = ref_param.AsElementId()
+        else:
+            # Parse only plain digit strings instead of relying on exceptions
+            ref_id_str = (ref_param.AsString() or "").strip()
+            if ref_id_str.isdigit():
+                ref_id = ElementId(int(ref_id_str))
+
+        if ref_id is not None and ref_id != ElementId.InvalidElementId:
+            elem = doc.GetElement(ref_id)
             if elem:
                 return RevitDuct(doc, view, elem)
-        except Exception:
-            pass
 
     # Fallback: bbox intersect to find a duct
     bbox = hanger.get_BoundingBox(None)
     if bbox:
         outline = Outline(bbox.Min, bbox.Max)
-        bbox_filter = BoundingBoxIntersectsFilter(outline)
-        # Use cached ducts to avoid repeated collectors
-        for d in ducts_cache:
-            d_bbox = d.element.get_BoundingBox(None)
-            if not d_bbox:
-                continue
-            d_outline = Outline(d_bbox.Min, d_bbox.Max)
+        # Use cached duct outlines to avoid repeated bbox reads
+        for d, d_outline in duct_outlines:
             if outline.Intersects(d_outline, 0):
                 return d
     return None
@@ -87,19 +124,33 @@ all_hangers = FilteredElementCollector(doc, view.Id)\
     .OfCategory(BuiltInCategory.OST_FabricationHangers)\
     .WhereElementIsNotElementType()\
     .ToElements()
+duct_outlines = build_duct_outlines(all_ducts)
+outline_by_duct_id = dict((d.id, o) for d, o in duct_outlines)
 
 pending_hanger_ids = [h.Id for h in all_hangers]
 processed_duct_ids = set()
 processed_hanger_ids = set()
 run_number = 0
 
+# Per-run results; the markdown report is built once after processing
+hanger_runs = []
+last_selection_ids = []
+unassigned_runs = []
+
+# (element, parameter names, value) writes, applied in one transaction
+pending_writes = []
+
 while pending_hanger_ids:
     hanger_id = pending_hanger_ids.pop(0)
+    # Hangers claimed by an earlier run are skipped via set lookup
+    if hanger_id in processed_hanger_ids:
+        continue
+
     hanger = doc.GetElement(hanger_id)
     if not hanger:
         continue
 
-    host_duct = get_host_duct_from_hanger(hanger, all_ducts)
+    host_duct = get_host_duct_from_hanger(hanger, duct_outlines)
     if not host_duct:
         # Could not resolve host; skip
         continue
@@ -111,17 +162,21 @@ while pending_hanger_ids:
 
     # Build run from the host duct
     run = RevitRuns.create_duct_run(host_duct, doc, view)
-    RevitElement.select_many(uidoc, run)
-    run_total_length = sum(d.length or 0 for d in run)
-    run_total_weight = sum(d.weight or 0 for d in run)
+    run_total_length = 0.0
+    run_total_weight = 0.0
+    for d in run:
+        run_total_length += d.length or 0
+        run_total_weight += d.weight or 0
 
     # Collect hangers intersecting any duct in this run
-    run_hanger_ids = set()
+    run_hangers_by_id = {}
     for duct in run:
-        bbox = duct.element.get_BoundingBox(None)
-        if not bbox:
+        # Reuse the outline built for the view's ducts when available
+        outline = outline_by_duct_id.get(duct.id)
+        if outline is None:
+            outline = get_duct_outline(duct)
+        if outline is None:
             continue
-        outline = Outline(bbox.Min, bbox.Max)
         bbox_filter = BoundingBoxIntersectsFilter(outline)
         intersecting = FilteredElementCollector(doc)\
             .OfCategory(BuiltInCategory.OST_FabricationHangers)\
@@ -131,114 +186,54 @@ while pending_hanger_ids:
         for h in intersecting:
             # Skip hangers already assigned to previous runs
             if h.Id not in processed_hanger_ids:
-                run_hanger_ids.add(h.Id)
+                run_hangers_by_id[h.Id] = h
 
-    # Convert IDs back to elements
-    run_hangers = [doc.GetElement(hid) for hid in run_hanger_ids]
+    # Keep the collected elements instead of fetching them again by ID
+    run_hanger_ids = set(run_hangers_by_id)
+    run_hangers = list(run_hangers_by_id.values())
 
-    # Remove processed hangers from pending list and mark as processed
-    pending_hanger_ids = [
-        hid for hid in pending_hanger_ids if hid not in run_hanger_ids]
+    # Mark processed; pending entries are skipped when they are popped
     processed_hanger_ids.update(run_hanger_ids)
 
     if run_hangers:
         weight_per_hanger = run_total_weight / \
             len(run_hangers) if run_hangers else 0
         hanger_ids = [h.Id for h in run_hangers]
-        RevitElement.select_many(uidoc, run_hangers)
-
-        with revit.Transaction("Set Hanger Mark - Run {}".format(run_number)):
-            for h in run_hangers:
-                set_parameter = None
-                for parameter_name in hanger_parameters:
-                    p = h.LookupParameter(parameter_name)
-                    if not p or p.IsReadOnly:
-                        continue
-                    set_parameter = p
-                    break
-
-                if set_parameter:
-                    try:
-                        if set_parameter.StorageType == StorageType.Double:
-                            set_parameter.Set(weight_per_hanger)
-                        elif set_parameter.StorageType == StorageType.String:
-                            set_parameter.Set(str(round(weight_per_hanger, 2)))
-                    except Exception:
-                        pass
-
-            # Set run weight on each duct in the run
-            for d in run:
-                set_parameter = None
-                for parameter_name in duct_parameters:
-                    p = d.element.LookupParameter(parameter_name)
-                    if not p or p.IsReadOnly:
-                        continue
-                    set_parameter = p
-                    break
-
-                if set_parameter:
-                    try:
-                        if set_parameter.StorageType == StorageType.Double:
-                            set_parameter.Set(round(run_total_weight, 2))
-                        elif set_parameter.StorageType == StorageType.String:
-                            set_parameter.Set(str(round(run_total_weight, 2)))
-                    except Exception:
-                        pass
-
-        output.print_md("---")
-        output.print_md("# Run {}".format(run_number))
-        output.print_md("Hangers: {} | Support each: {:0.2f} lbs".format(
-            output.linkify(hanger_ids), weight_per_hanger))
+
+        for h in run_hangers:
+            pending_writes.append((h, hanger_parameters, weight_per_hanger))
+
+        # Set run weight on each duct in the run
+        for d in run:
+            pending_writes.append(
+                (d.element, duct_parameters, round(run_total_weight, 2)))
 
     else:
-        output.print_md("---")
-        output.print_md("# Run {}".format(run_number))
-        output.print_md("Hangers: None found")
-
-        with revit.Transaction("Set Duct Weight - Run {}".format(run_number)):
-            for d in run:
-                set_parameter = None
-                for parameter_name in duct_parameters:
-                    p = d.element.LookupParameter(parameter_name)
-                    if not p or p.IsReadOnly:
-                        continue
-                    set_parameter = p
-                    break
-
-                if set_parameter:
-                    try:
-                        if set_parameter.StorageType == StorageType.Double:
-                            set_parameter.Set(round(run_total_weight, 2))
-                        elif set_parameter.StorageType == StorageType.String:
-                            set_parameter.Set(str(round(run_total_weight, 2)))
-                    except Exception:
-                        pass
-
-    # Totals
-    duct_element_ids = [d.element.Id for d in run]
-    total_length_ft = run_total_length / 12.0 if run_total_length else 0.0
-    lbs_per_ft = (run_total_weight /
-                  total_length_ft) if total_length_ft else 0.0
-    length_str = "{:06.2f}".format(float(total_length_ft))
-    weight_str = "{:6.2f}".format(float(run_total_weight))
-    lbs_ft_str = "{:6.2f}".format(float(lbs_per_ft))
-    duct_ids_str = str(output.linkify(duct_element_ids))
-    output.print_md("Ducts: {} | Qty: {} | Length: {} ft | Weight: {} lbs | lbs/ft: {}".format(
-        duct_ids_str,
-        len(duct_element_ids),
-        length_str,
-        weight_str,
-        lbs_ft_str
+        hanger_ids = []
+        weight_per_hanger = 0.0
+
+        for d in run:
+            pending_writes.append(
+                (d.element, duct_parameters, round(run_total_weight, 2)))
+
+    duct_ids = [d.element.Id for d in run]
+    hanger_runs.append((
+        run_number,
+        duct_ids,
+        hanger_ids,
+        weight_per_hanger,
+        run_total_weight,
+        run_total_length,
     ))
 
+    # The last run's hangers, or its ducts when it has none, end up selected
+    last_selection_ids = hanger_ids or duct_ids
+
     # Mark ducts processed
     for d in run:
         processed_duct_ids.add(d.id)
 
 # Process remaining ducts without hangers
-output.print_md("---")
-output.print_md("## Processing unassigned ducts")
-
 remaining_ducts = [d for d in all_ducts if d.id not in processed_duct_ids]
 
 while remaining_ducts:
@@ -248,54 +243,74 @@ while remaining_ducts:
     run = RevitRuns.create_duct_run(host_duct, doc, view)
     run_number += 1
 
-    run_total_weight = sum(d.weight or 0 for d in run)
-    run_total_length = sum(d.length or 0 for d in run)
+    run_total_weight = 0.0
+    run_total_length = 0.0
+    for d in run:
+        run_total_weight += d.weight or 0
+        run_total_length += d.length or 0
 
     # Remove these ducts from remaining_ducts
-    remaining_ducts = [
-        d for d in remaining_ducts if d.id not in set(rd.id for rd in run)]
+    run_ids = set(rd.id for rd in run)
+    remaining_ducts = [d for d in remaining_ducts if d.id not in run_ids]
 
     if run_total_weight > 0:
-        with revit.Transaction("Set Duct Weight - Run {} (no hangers)".format(run_number)):
-            for d in run:
-                set_parameter = None
-                for parameter_name in duct_parameters:
-                    p = d.element.LookupParameter(parameter_name)
-                    if not p or p.IsReadOnly:
-                        continue
-                    set_parameter = p
-                    break
-
-                if set_parameter:
-                    try:
-                        if set_parameter.StorageType == StorageType.Double:
-                            set_parameter.Set(round(run_total_weight, 2))
-                        elif set_parameter.StorageType == StorageType.String:
-                            set_parameter.Set(str(round(run_total_weight, 2)))
-                    except Exception:
-                        pass
-
-    # Output
-    duct_element_ids = [d.element.Id for d in run]
-    total_length_ft = run_total_length / 12.0 if run_total_length else 0.0
-    lbs_per_ft = (run_total_weight /
-                  total_length_ft) if total_length_ft else 0.0
-    length_str = "{:06.2f}".format(float(total_length_ft))
-    weight_str = "{:6.2f}".format(float(run_total_weight))
-    lbs_ft_str = "{:6.2f}".format(float(lbs_per_ft))
-    duct_ids_str = str(output.linkify(duct_element_ids))
-
-    output.print_md("---")
-    output.print_md("# Run {}".format(run_number))
-    output.print_md("Ducts: {} | Qty: {} | Length: {} ft | Weight: {} lbs | lbs/ft: {}".format(
-        duct_ids_str,
-        len(duct_element_ids),
-        length_str,
-        weight_str,
-        lbs_ft_str
+        for d in run:
+            pending_writes.append(
+                (d.element, duct_parameters, round(run_total_weight, 2)))
+
+    unassigned_runs.append((
+        run_number,
+        [d.element.Id for d in run],
+        run_total_weight,
+        run_total_length,
     ))
 
-output.print_md("---")
-output.print_md(
+# Write every run's weights in a single transaction
+if pending_writes:
+    with revit.Transaction("Set Run Weights"):
+        for element, parameter_names, value in pending_writes:
+            write_weight(element, parameter_names, value)
+
+
+# Report
+# =================================================
+def format_duct_line(duct_ids, run_weight, run_length):
+    """Format the duct totals line for one run."""
+    total_length_ft = run_length / 12.0 if run_length else 0.0
+    lbs_per_ft = (run_weight / total_length_ft) if total_length_ft else 0.0
+    return "Ducts: {} | Qty: {} | Length: {} ft | Weight: {} lbs | lbs/ft: {}".format(
+        output.linkify(duct_ids),
+        len(duct_ids),
+        "{:06.2f}".format(float(total_length_ft)),
+        "{:6.2f}".format(float(run_weight)),
+        "{:6.2f}".format(float(lbs_per_ft))
+    )
+
+
+lines = []
+for run_no, duct_ids, hanger_ids, weight_per_hanger, run_weight, run_length in hanger_runs:
+    lines.append("---")
+    lines.append("# Run {}".format(run_no))
+    if hanger_ids:
+        lines.append("Hangers: {} | Support each: {:0.2f} lbs".format(
+            output.linkify(hanger_ids), weight_per_hanger))
+    else:
+        lines.append("Hangers: None found")
+    lines.append(format_duct_line(duct_ids, run_weight, run_length))
+
+lines.append("---")
+lines.append("## Processing unassigned ducts")
+for run_no, duct_ids, run_weight, run_length in unassigned_runs:
+    lines.append("---")
+    lines.append("# Run {}".format(run_no))
+    lines.append(format_duct_line(duct_ids, run_weight, run_length))
+
+lines.append("---")
+lines.append(
     "## Processing complete - {} runs processed".format(run_number))
+output.print_md("\n\n".join(lines))
+
+# Select once at the end instead of on every run
+if last_selection_ids:
+    RevitElement.select_many(uidoc, List[ElementId](last_selection_ids))
 print_disclaimer(output)
@@ -15,6 +15,7 @@ from runs.revit_runs import RevitRuns
 from constants.print_outputs import print_disclaimer
 from pyrevit import revit, script
 from Autodesk.Revit.DB import *
+from System.Collections.Generic import List
 from config.parameters_registry import *
 
 # Button info
@@ -43,38 +44,53 @@ duct_parameters = [
     RVT_MARK,
 ]
 
+
+def find_writable_parameter(element, parameter_names):
+    """Return the first writable parameter found by name, or None."""
+    for name in parameter_names:
+        p = element.LookupParameter(name)
+        if p and not p.IsReadOnly:
+            return p
+    return None
+
+
 # Main Code
 # =================================================
 
 # Filter down to a single selected duct
-selected_duct = RevitDuct.from_selection(uidoc, doc, view)
-selected_duct = selected_duct[0] if selected_duct else None
+sel = RevitDuct.from_selection(uidoc, doc, view)
+selected_duct = sel[0] if sel else None
 
 if selected_duct:
     # Build the run from the selected duct
     run = RevitRuns.create_duct_run(selected_duct, doc, view)
     RevitElement.select_many(uidoc, run)
 
-    run_total_length = sum(d.length or 0 for d in run)
-    run_total_weight = sum(d.weight or 0 for d in run)
+    run_total_length = 0.0
+    run_total_weight = 0.0
+    for d in run:
+        run_total_length += d.length or 0
+        run_total_weight += d.weight or 0
 
-    # Collect hangers that intersect any duct in the run
-    hangers = set()
+    # Collect hangers that intersect any duct in the run with one
+    # collector pass over the OR of all duct bounding boxes
+    bbox_filters = List[ElementFilter]()
     for duct in run:
         bbox = duct.element.get_BoundingBox(None)
         if not bbox:
             continue
         outline = Outline(bbox.Min, bbox.Max)
-        bbox_filter = BoundingBoxIntersectsFilter(outline)
-        intersecting = (FilteredElementCollector(doc)
-                        .OfCategory(BuiltInCategory.OST_FabricationHangers)
-                        .WherePasses(bbox_filter)
-                        .WhereElementIsNotElementType()
-                        .ToElements())
-        for h in intersecting:
-            hangers.add(h)
-
-    hangers = list(hangers)
+        bbox_filters.Add(BoundingBoxIntersectsFilter(outline))
+
+    hangers = []
+    if bbox_filters.Count:
+        run_filter = (bbox_filters[0] if bbox_filters.Count == 1
+                      else LogicalOrFilter(bbox_filters))
+        hangers = list(FilteredElementCollector(doc)
+                       .OfCategory(BuiltInCategory.OST_FabricationHangers)
+                       .WherePasses(run_filter)
+                       .WhereElementIsNotElementType()
+                       .ToElements())
 
     if hangers:
         weight_per_hanger = run_total_weight / \
@@ -87,24 +103,16 @@ if selected_duct:
             len(hangers), output.linkify(hanger_ids)
         ))
 
+        # Resolve writable parameters before opening the transaction
+        hanger_writes = [find_writable_parameter(h, hanger_parameters)
+                         for h in hangers]
+        duct_writes = [find_writable_parameter(d.element, duct_parameters)
+                       for d in run]
+
         # Write parameters
         with revit.Transaction("Set Hanger Mark"):
             # Hanger instance values
-            for i, h in enumerate(hangers, start=1):
-                output.print_md(
-                    "### {} | ID: {} | Supporting: {:6.2f}lbs".format(
-                        i, output.linkify(h.Id), weight_per_hanger
-                    )
-                )
-
-                set_parameter = None
-                for name in hanger_parameters:
-                    p = h.LookupParameter(name)
-                    if not p or p.IsReadOnly:
-                        continue
-                    set_parameter = p
-                    break
-
+            for set_parameter in hanger_writes:
                 if set_parameter:
                     try:
                         if set_parameter.StorageType == StorageType.Double:
@@ -115,15 +123,7 @@ if selected_duct:
                         pass
 
             # Run weight on each duct in the run
-            for d in run:
-                set_parameter = None
-                for name in duct_parameters:
-                    p = d.element.LookupParameter(name)
-                    if not p or p.IsReadOnly:
-                        continue
-                    set_parameter = p
-                    break
-
+            for set_parameter in duct_writes:
                 if set_parameter:
                     try:
                         if set_parameter.StorageType == StorageType.Double:
@@ -133,6 +133,15 @@ if selected_duct:
                     except Exception:
                         pass
 
+        lines = []
+        for i, h in enumerate(hangers, start=1):
+            lines.append(
+                "### {} | ID: {} | Supporting: {:6.2f}lbs".format(
+                    i, output.linkify(h.Id), weight_per_hanger
+                )
+            )
+        output.print_md("\n\n".join(lines))
+
         # Summary
         duct_element_ids = [d.element.Id for d in run]
         total_length_ft = run_total_length / 12.0 if run_total_length else 0.0
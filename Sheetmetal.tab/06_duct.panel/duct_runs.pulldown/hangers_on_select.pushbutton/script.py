@@ -29,28 +29,41 @@ uidoc = __revit__.ActiveUIDocument
 view = revit.active_view
 output = script.get_output()
 
-hanger_parameters = {
+hanger_parameters = (
     PYT_WEIGHT_SUPPORT,
-}
+)
 
-duct_parameters = {
+duct_parameters = (
     PYT_WEIGHT_RUN,
-}
+)
 
 
 def safe_float(val):
     """Convert value to float, return 0.0 if conversion fails"""
+    if isinstance(val, float):
+        return val
+    if val is None:
+        return 0.0
     try:
         return float(val)
     except Exception:
         return 0.0
 
 
-def normalize_size(size_string):
-    """Remove 'x' and 'ø' symbols from size string for comparison"""
-    if not size_string:
-        return None
-    return size_string.replace("ø", "").replace("x", "")
+def find_writable_parameter(element, parameter_names):
+    """Return the first writable parameter found by name, or None"""
+    for parameter_name in parameter_names:
+        param = element.LookupParameter(parameter_name)
+        if param and not param.IsReadOnly:
+            return param
+    return None
+
+
+def bboxes_overlap(amin, amax, bmin, bmax):
+    """Axis-aligned overlap test, touching boxes count as overlapping"""
+    return not (amax.X < bmin.X or amin.X > bmax.X or
+                amax.Y < bmin.Y or amin.Y > bmax.Y or
+                amax.Z < bmin.Z or amin.Z > bmax.Z)
 
 
 # Main Code
@@ -62,28 +75,49 @@ selected_ducts = RevitDuct.from_selection(uidoc, doc, view)
 if not selected_ducts:
     output.print_md("## Select one or more ducts first")
 else:
-    # Calculate total properties from all selected ducts
-    total_length = sum(d.length or 0 for d in selected_ducts)
-    total_weight = sum(safe_float(d.weight) or 0 for d in selected_ducts)
+    # Calculate total properties from all selected ducts in one pass
+    total_length = 0.0
+    total_weight = 0.0
+    for d in selected_ducts:
+        total_length += d.length or 0
+        total_weight += safe_float(d.weight) or 0
+
+    # Read each selected duct bounding box once
+    duct_bounds = []
+    for duct in selected_ducts:
+        bbox = duct.element.get_BoundingBox(None)
+        if bbox:
+            duct_bounds.append((bbox.Min, bbox.Max))
+
+    # Only hangers inside the union of the selected duct boxes can match
+    candidate_hangers = []
+    if duct_bounds:
+        union_min = XYZ(min(b[0].X for b in duct_bounds),
+                        min(b[0].Y for b in duct_bounds),
+                        min(b[0].Z for b in duct_bounds))
+        union_max = XYZ(max(b[1].X for b in duct_bounds),
+                        max(b[1].Y for b in duct_bounds),
+                        max(b[1].Z for b in duct_bounds))
+        union_filter = BoundingBoxIntersectsFilter(
+            Outline(union_min, union_max))
+        candidate_hangers = FilteredElementCollector(doc)\
+            .OfCategory(BuiltInCategory.OST_FabricationHangers)\
+            .WherePasses(union_filter)\
+            .WhereElementIsNotElementType()\
+            .ToElements()
+
+    hanger_bounds = []
+    for h in candidate_hangers:
+        hbb = h.get_BoundingBox(None)
+        if hbb:
+            hanger_bounds.append((h, hbb.Min, hbb.Max))
 
     # Get hangers that intersect with selected ducts via bounding box
     hangers = set()  # Use set to avoid duplicates
 
-    for duct in selected_ducts:
-        bbox = duct.element.get_BoundingBox(None)
-        if bbox:
-            # Create filter for elements intersecting this bounding box
-            outline = Outline(bbox.Min, bbox.Max)
-            bbox_filter = BoundingBoxIntersectsFilter(outline)
-
-            # Collect hangers intersecting this duct
-            intersecting_hangers = FilteredElementCollector(doc)\
-                .OfCategory(BuiltInCategory.OST_FabricationHangers)\
-                .WherePasses(bbox_filter)\
-                .WhereElementIsNotElementType()\
-                .ToElements()
-
-            for h in intersecting_hangers:
+    for dmin, dmax in duct_bounds:
+        for h, hmin, hmax in hanger_bounds:
+            if bboxes_overlap(dmin, dmax, hmin, hmax):
                 hangers.add(h)
 
     hangers = list(hangers)  # Convert back to list
@@ -102,45 +136,42 @@ else:
             output.linkify(hanger_ids)
         ))
 
+        # Resolve writable parameters before opening the transaction
+        hanger_writes = [
+            (hanger, find_writable_parameter(hanger, hanger_parameters))
+            for hanger in hangers
+        ]
+        duct_writes = [
+            find_writable_parameter(d.element, duct_parameters)
+            for d in selected_ducts
+        ]
+
         # Set parameters on hangers and ducts
         with revit.Transaction("Set Hanger and Duct Marks"):
-            for i, hanger in enumerate(hangers, start=1):
-                output.print_md("### {} | ID: {} | Supporting: {:.2f} lbs".format(
-                    i,
-                    output.linkify(hanger.Id),
-                    weight_per_hanger
-                ))
-
-                # Try each hanger parameter in order, set the first writable one
-                set_success = False
-                for parameter_name in hanger_parameters:
-                    param = hanger.LookupParameter(parameter_name)
-                    if param and not param.IsReadOnly:
-                        param.Set(weight_per_hanger)
-                        set_success = True
-                        break
-                if not set_success:
-                    output.print_md(
-                        'Could not set any parameter on hanger ID {}'.format(
-                            output.linkify(hanger.Id)
-                        ))
+            for hanger, set_parameter in hanger_writes:
+                if set_parameter:
+                    set_parameter.Set(weight_per_hanger)
 
             # Set run weight on each selected duct
-            for d in selected_ducts:
-                set_parameter = None
-                for parameter_name in duct_parameters:
-                    p = d.element.LookupParameter(parameter_name)
-                    if not p:
-                        continue
-                    elif p.IsReadOnly:
-                        continue
-                    else:
-                        set_parameter = p
-                        break
-
+            for set_parameter in duct_writes:
                 if set_parameter:
                     set_parameter.Set(total_weight)
 
+        lines = []
+        for i, (hanger, set_parameter) in enumerate(hanger_writes, start=1):
+            hanger_link = output.linkify(hanger.Id)
+            lines.append("### {} | ID: {} | Supporting: {:.2f} lbs".format(
+                i,
+                hanger_link,
+                weight_per_hanger
+            ))
+            if not set_parameter:
+                lines.append(
+                    'Could not set any parameter on hanger ID {}'.format(
+                        hanger_link
+                    ))
+        output.print_md("\n\n".join(lines))
+
         output.print_md("---")
 
     # Display duct information
@@ -34,13 +34,9 @@ output = script.get_output()
 # Main Code
 # ==================================================
 
-# Get all ducts
-ducts = RevitDuct.all(doc, view)
-duct = RevitDuct.from_selection(uidoc, doc, view)
-
-# Filter down to short joints
-selected_duct = RevitDuct.from_selection(uidoc, doc, view)
-selected_duct = selected_duct[0] if selected_duct else None
+# Get selected duct
+sel = RevitDuct.from_selection(uidoc, doc, view)
+selected_duct = sel[0] if sel else None
 
 # Start of select / print loop
 if selected_duct:
@@ -48,29 +44,37 @@ if selected_duct:
     run = RevitRuns.create_duct_run(selected_duct, doc, view)
     RevitElement.select_many(uidoc, run)
 
-    for i, sel in enumerate(run, start=1):
-        length_val = sel.length if sel.length else 0.0
-        weight_val = sel.weight if sel.weight else 0.0
+    # Read length and weight once per duct; rows feed both printing and totals
+    rows = [(d, d.length or 0.0, d.weight or 0.0) for d in run]
+
+    row_template = '### No: {:03} | ID: {} | Length: {} | Weight {} | lbs/ft: {} | Size: {}'
+    lines = []
+    element_ids = []
+    total_length = 0.0
+    total_weight = 0.0
+    for i, (sel, length_val, weight_val) in enumerate(rows, start=1):
+        elem_id = sel.element.Id
+        element_ids.append(elem_id)
+        total_length += length_val
+        total_weight += weight_val
         lbs_per_ft = (weight_val / (length_val / 12.0)) if length_val else 0.0
         size_val = sel.size if sel.size else "Unknown"
 
         length_str = "{:06.2f}".format(float(length_val))
         weight_str = "{:06.2f}".format(float(weight_val))
         lbs_ft_str = "{:06.2f}".format(float(lbs_per_ft))
-        output.print_md(
-            '### No: {:03} | ID: {} | Length: {} | Weight {} | lbs/ft: {} | Size: {}'.format(
-                i,
-                output.linkify(sel.element.Id),
-                length_str,
-                weight_str,
-                lbs_ft_str,
-                size_val,
-            ))
+        lines.append(row_template.format(
+            i,
+            output.linkify(elem_id),
+            length_str,
+            weight_str,
+            lbs_ft_str,
+            size_val,
+        ))
+    if lines:
+        output.print_md("\n\n".join(lines))
 
     # Total count
-    element_ids = [d.element.Id for d in run]
-    total_length = sum(d.length or 0 for d in run)
-    total_weight = sum(d.weight or 0 for d in run)
     total_lbs_per_ft = (total_weight / (total_length / 12.0)
                         ) if total_length else 0.0
     output.print_md("---")
@@ -27,7 +27,7 @@ uidoc = __revit__.ActiveUIDocument
 output = script.get_output()
 
 # Families targeted by the Offset Data script.
-FAMILY_LIST = {
+FAMILY_LIST = frozenset({
     'offset',
     'ogee',
     'oval reducer',
@@ -36,7 +36,26 @@ FAMILY_LIST = {
     'square to ø',
     'transition',
     'cid330 - (radius 2-way offset)',
-}
+})
+
+# (display name, normalized name) per fitting type id
+family_names_by_type = {}
+
+
+def get_family_names(element):
+    """Return (FamilyName, normalized name) for element, cached per type."""
+    type_id = element.GetTypeId()
+    names = family_names_by_type.get(type_id)
+    if names is None:
+        family_type = doc.GetElement(type_id)
+        if family_type:
+            family_name = family_type.FamilyName
+            names = (family_name,
+                     family_name.lower().replace('*', '').strip())
+        else:
+            names = ("Unknown", None)
+        family_names_by_type[type_id] = names
+    return names
 
 
 # Main Code
@@ -49,39 +68,36 @@ all_duct = (FilteredElementCollector(doc, active_view.Id)
             .WherePasses(VisibleInViewFilter(doc, active_view.Id))
             .ToElements())
 
-matched_elements = []
+# Filter and build the report rows in one pass over the view
+matched_ids = []
+lines = []
+row_template = '### Index: {:03} | Element ID: {} | Offset: {} | Family: {}'
 for d in all_duct:
-    family_type = doc.GetElement(d.GetTypeId())
-    if not family_type:
+    display_name, family_name = get_family_names(d)
+    if family_name not in FAMILY_LIST:
         continue
-    family_name = family_type.FamilyName.lower().replace('*', '').strip()
-    if family_name in FAMILY_LIST:
-        matched_elements.append(d)
+    matched_ids.append(d.Id)
+
+    offset_param = d.LookupParameter(PYT_OFFSET_VALUE)
+    offset_str = "-"
+    if offset_param:
+        offset_str = offset_param.AsString() or offset_param.AsValueString() or "-"
+
+    lines.append(row_template.format(
+        len(matched_ids),
+        output.linkify(d.Id),
+        offset_str,
+        display_name,
+    ))
 
-if not matched_elements:
+if not matched_ids:
     forms.alert("No offset elements found in current view.", exitscript=True)
 
 # Select all matched offsets
-id_list = List[ElementId]([e.Id for e in matched_elements])
-uidoc.Selection.SetElementIds(id_list)
+uidoc.Selection.SetElementIds(List[ElementId](matched_ids))
 
 # Print output
-for i, elem in enumerate(matched_elements, start=1):
-    family_type = doc.GetElement(elem.GetTypeId())
-    family_name = family_type.FamilyName if family_type else "Unknown"
-    offset_param = elem.LookupParameter(PYT_OFFSET_VALUE)
-    offset_str = "-"
-    if offset_param:
-        offset_str = offset_param.AsString() or offset_param.AsValueString() or "-"
-
-    output.print_md(
-        '### Index: {:03} | Element ID: {} | Offset: {} | Family: {}'.format(
-            i,
-            output.linkify(elem.Id),
-            offset_str,
-            family_name,
-        )
-    )
+output.print_md("\n\n".join(lines))
 
 output.print_md("---")
-output.print_md("# Total Elements Selected: {}".format(len(matched_elements)))
+output.print_md("# Total Elements Selected: {}".format(len(matched_ids)))
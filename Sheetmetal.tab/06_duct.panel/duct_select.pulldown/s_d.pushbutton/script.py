@@ -37,16 +37,18 @@ output = script.get_output()
 ducts = RevitDuct.all(doc, view)
 
 # Family / connector combo to find
-allowed = {
+allowed = frozenset({
     ("straight", "slip & drive"),
     ("straight", "s&d"),
     ("straight", "standing s&d")
-}
+})
 
 # List of filtered ducts
-normalized = [(d, (d.family or "").lower().strip(),
-               (d.connector_0_type or "").lower().strip()) for d in ducts]
-fil_ducts = [d for d, fam, conn in normalized if (fam, conn) in allowed]
+fil_ducts = [
+    d for d in ducts
+    if ((d.family or "").lower().strip(),
+        (d.connector_0_type or "").lower().strip()) in allowed
+]
 
 # Start of select / print loop
 if fil_ducts:
@@ -37,14 +37,16 @@ output = script.get_output()
 ducts = RevitDuct.all(doc, view)
 
 # Families allowed
-allowed = {
+allowed = frozenset({
     ("spiral duct", "raw"),
-}
+})
 
 # Nomalize and filter duct
-normalized = [(d, (d.family or "").lower().strip(),
-               (d.connector_0_type or "").lower().strip()) for d in ducts]
-fil_ducts = [d for d, fam, conn in normalized if (fam, conn) in allowed]
+fil_ducts = [
+    d for d in ducts
+    if ((d.family or "").lower().strip(),
+        (d.connector_0_type or "").lower().strip()) in allowed
+]
 
 # Start of select / print
 if fil_ducts:
@@ -37,20 +37,17 @@ output = script.get_output()
 ducts = RevitDuct.all(doc, view)
 
 # Families allowed
-allowed = {
+allowed = frozenset({
     ("straight", "tdc"),
     ("straight", "tdf"),
-}
+})
 
 # Nomalize and filter duct
-normalized = [
-    (
-        d,
-        (d.family or "").lower().strip(),
-        (d.connector_0_type or "").lower().strip()
-    ) for d in ducts
+fil_ducts = [
+    d for d in ducts
+    if ((d.family or "").lower().strip(),
+        (d.connector_0_type or "").lower().strip()) in allowed
 ]
-fil_ducts = [d for d, fam, conn in normalized if (fam, conn) in allowed]
 
 # Start of select / print
 if fil_ducts:
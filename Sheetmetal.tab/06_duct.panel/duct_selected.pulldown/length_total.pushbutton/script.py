@@ -38,22 +38,29 @@ if ducts:
     output.print_md(
         '---')
 
-    # Individual properties
+    # Individual properties and running totals
+    element_ids = []
+    total_in = 0.0
+    lines = []
+    row_template = '### Index: {:03d} | Element ID: {} | Length: {:06.2f}" | Size: {} | Family: {}'
     for i, d in enumerate(ducts, start=1):
+        length_in = d.length
+        element_ids.append(d.element.Id)
+        if length_in is not None:
+            total_in += length_in
         if len(ducts) < 501:
-            output.print_md(
-                '### Index: {:03d} | Element ID: {} | Length: {:06.2f}" | Size: {} | Family: {}'.format(
-                    i,
-                    output.linkify(d.element.Id),
-                    d.length / 12 if d.length is not None else 0.00,
-                    d.size,
-                    d.family,
-                )
-            )
+            lines.append(row_template.format(
+                i,
+                output.linkify(d.element.Id),
+                length_in / 12 if length_in is not None else 0.00,
+                d.size,
+                d.family,
+            ))
+    if lines:
+        output.print_md('\n\n'.join(lines))
 
-    # Final totals loop and link
-    element_ids = [d.element.Id for d in ducts]
-    total_ft = (sum(d.length for d in ducts if d.length is not None) / 12.0)
+    # Final totals and link
+    total_ft = total_in / 12.0
     total_ct = len(ducts)
     output.print_md(
         '# Total: {} | ID: {} | Total: {:.2f}ft | Average: {:06.2f}in'.format(
@@ -10,6 +10,7 @@ the copyright holder."""
 from pyrevit import revit, script
 from Autodesk.Revit.DB import StorageType
 from config.parameters_registry import *
+import re
 
 # Button info
 # ======================================================================
@@ -27,33 +28,29 @@ Reverses the offset direction by:
 output = script.get_output()
 
 
+# Token swaps applied in a single pass: TU/TD, legacy UP/DN and arrows
+offset_swaps = {
+    'TU': 'TD',
+    'TD': 'TU',
+    'DN': 'UP',
+    'UP': 'DN',
+    '→': '←',
+    '←': '→',
+    '↓': '↑',
+    '↑': '↓',
+}
+offset_swap_pattern = re.compile(
+    '|'.join(re.escape(token) for token in offset_swaps))
+
+
 def reverse_offset_value(value):
     """Reverse the offset value by swapping TU/TD (and UP/DN) and arrows."""
     if not value:
         return value
 
-    result = value
-
-    # Primary: swap TU and TD using placeholders to avoid overlap
-    result = result.replace('TU', '\x00TEMP_TU\x00')
-    result = result.replace('TD', 'TU')
-    result = result.replace('\x00TEMP_TU\x00', 'TD')
-
-    # Legacy: swap DN and UP as well (if any remain)
-    result = result.replace('DN', '\x00TEMP_DN\x00')
-    result = result.replace('UP', 'DN')
-    result = result.replace('\x00TEMP_DN\x00', 'UP')
-
-    # Flip vertical arrows 180 degrees
-    result = result.replace('→', '\x00ARROW_RIGHT\x00')
-    result = result.replace('←', '→')
-    result = result.replace('\x00ARROW_RIGHT\x00', '←')
-
-    result = result.replace('↓', '\x00ARROW_UP\x00')
-    result = result.replace('↑', '↓')
-    result = result.replace('\x00ARROW_UP\x00', '↑')
-
-    return result
+    # Each match is replaced once, so no placeholders are needed
+    return offset_swap_pattern.sub(
+        lambda match: offset_swaps[match.group(0)], value)
 
 
 # Main Code
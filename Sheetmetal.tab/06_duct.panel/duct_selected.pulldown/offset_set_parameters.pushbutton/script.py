@@ -7,12 +7,18 @@ distributed, or used in any form without the prior written permission of
 the copyright holder."""
 # ======================================================================
 
-from geometry.offsets import Offsets
-from geometry.size import Size
+from geometry.size import get_size
 from ducts.revit_xyz import RevitXYZ
-from pyrevit import revit, script
+from pyrevit import forms, revit, script
 from Autodesk.Revit.DB import StorageType
 from config.parameters_registry import *
+from ducts.revit_offset_classify import (
+    calculate_offset,
+    digit_pattern,
+    get_family_name,
+    get_parameter_map,
+    parameters,
+)
 
 # Button info
 # ======================================================================
@@ -27,7 +33,7 @@ Writes offset data for all fittings
 output = script.get_output()
 PRINT_OUTPUT = False
 
-family_list = {
+family_list = frozenset({
     'offset',
     'gored elbow',
     'ogee',
@@ -37,20 +43,22 @@ family_list = {
     'square to ø',
     'transition',
     'cid330 - (radius 2-way offset)'
+})
+
+# Every parameter the writer touches, read in one scan per fitting
+offset_parameter_names = set(parameters) | {
+    RVT_SIZE,
+    PYT_OFFSET_VALUE,
+    LEGACY_OFFSET,
+    JG_OFFSET_LEFT,
+    JG_OFFSET_RIGHT,
 }
 
-parameters = {
-    PYT_OFFSET_CENTER_H: 'center_horizontal',
-    PYT_OFFSET_CENTER_V: 'center_vertical',
-    PYT_OFFSET_TOP: 'top',
-    PYT_OFFSET_BOTTOM: 'bottom',
-    PYT_OFFSET_RIGHT: 'right',
-    PYT_OFFSET_LEFT: 'left',
-}
+# Normalized family name per fitting type id
+family_name_cache = {}
 
-tag_paramger = {
-    PYT_OFFSET_VALUE
-}
+# (fitting, classification) per offset_signature
+offset_results = {}
 
 
 def _try_parse_float(value_text):
@@ -64,9 +72,14 @@ def _try_parse_float(value_text):
         return None
 
 
-def _copy_param_value(element, source_name, target_name, source_inches=False):
-    source_param = element.LookupParameter(source_name)
-    target_param = element.LookupParameter(target_name)
+def _copy_param_value(element, source_name, target_name, source_inches=False,
+                      param_map=None):
+    if param_map is not None:
+        source_param = param_map.get(source_name)
+        target_param = param_map.get(target_name)
+    else:
+        source_param = element.LookupParameter(source_name)
+        target_param = element.LookupParameter(target_name)
     if not source_param or not target_param or target_param.IsReadOnly:
         return
 
@@ -95,186 +108,83 @@ def _copy_param_value(element, source_name, target_name, source_inches=False):
         pass
 
 
-def should_add_tag_prefix(classification):
-    """Legacy detector for vertical UP/DN with numbers.
-
-    Kept for compatibility to detect vertical tokens; we no longer add
-    'T:' but use it to decide TU/TD conversion.
-    """
-    import re
-    if re.search(r'\b(UP|DN)\s*\d+', classification):
-        return True
-    return False
-
-
-def convert_to_TU_TD(value):
-    """Convert UP/DN tokens to TU/TD with arrows (TU↑ / TD↓).
+# Detailed report templates
+header_template = "# Element ID: {} | Category {}"
+size_template = "### Size: {} | Inlet: {} | Outlet {}"
+shape_template = "### {}: {} | Shape: {} | W:{} H:{} D:{}"
+coord_template = "### {}: X: {:.3f}', Y: {:.3f}', Z: {:.3f}'"
+vector_template = "### {}: X: {:.3f}, Y: {:.3f}, Z: {:.3f}"
+offset_template = "### {} | '{:.3f}'"
+note_template = "### _duct_note | '{}'"
+report_order = (
+    "center_vertical",
+    "center_horizontal",
+    "top",
+    "bottom",
+    "right",
+    "left",
+)
+
+
+def _append_report(lines, element, fitting, inlet_data, outlet_data, size,
+                   final_classification):
+    """Append the detailed report for one fitting to lines."""
+    inlet = inlet_data['origin']
+    outlet = outlet_data['origin']
+
+    lines.append(header_template.format(
+        element.Id.Value,
+        element.Category.Name))
+
+    # General fitting information
+    lines.append(size_template.format(size.size, size.in_size, size.out_size))
+    lines.append(shape_template.format(
+        "Inlet",
+        size.in_size,
+        size.in_shape(),
+        size.in_width,
+        size.in_height,
+        size.in_diameter,
+    ))
+    lines.append(shape_template.format(
+        "Outlet",
+        size.out_size,
+        size.out_shape(),
+        size.out_width,
+        size.out_height,
+        size.out_diameter,
+    ))
+
+    # Coordinate
+    lines.append("## **Coordinates**")
+    lines.append(coord_template.format("Inlet", inlet.X, inlet.Y, inlet.Z))
+    lines.append(coord_template.format("Outlet", outlet.X, outlet.Y, outlet.Z))
+
+    # Debug: Show basis vectors
+    lines.append("## **Basis Vectors (Debug)**")
+    for label, data, key in (("Inlet Flow", inlet_data, 'basis_z'),
+                             ("Outlet Flow", outlet_data, 'basis_z'),
+                             ("Inlet Up", inlet_data, 'basis_y'),
+                             ("Inlet Right", inlet_data, 'basis_x')):
+        v = data.get(key)
+        if v:
+            lines.append(vector_template.format(label, v.X, v.Y, v.Z))
+
+    # Offset data
+    lines.append("## Offset data")
+    for key in report_order:
+        if key in fitting:
+            lines.append(offset_template.format(key, fitting[key]))
+
+    # Add _duct_note parameter
+    note_param = element.LookupParameter('_duct_note')
+    if note_param:
+        lines.append(note_template.format(note_param.AsString()))
+
+    # Add classification
+    lines.append("## Classification")
+    lines.append("### {}".format(final_classification))
 
-    - Removes leading 'T:' if present
-    - UP12/UP 12 -> TU12↑
-    - DN6/DN 6 -> TD6↓
-    - Leaves other tokens alone
-    """
-    try:
-        import re
-        if value is None:
-            return value
-        s = value.strip()
-        if s.startswith('T:'):
-            s = s[2:]
-        s = re.sub(r'\bUP\s*(\d+)\b', r'TU\1', s)
-        s = re.sub(r'\bDN\s*(\d+)\b', r'TD\1', s)
-        s = re.sub(r'\bTU(\d+)(?:[↑↓])?', r'TU\1↑', s)
-        s = re.sub(r'\bTD(\d+)(?:[↑↓])?', r'TD\1↓', s)
-        return s
-    except Exception:
-        return value
-
-
-def classify_offset(fit, inlet_data=None, outlet_data=None, size_obj=None):
-    """Classify offset values - vertical | horizontal.
-
-    Vertical: FOB, FOT, CL, UP, DN
-    Horizontal: FOL, FOR, CL, IN, OUT
-
-    If top and bottom are both 0, just return horizontal.
-    If left and right are both 0, just return vertical.
-    If both are CL, return just CL.
-
-    Args:
-        fit: Dictionary with offset values
-        inlet_data: Optional inlet connector data with basis vectors to normalize orientation
-        outlet_data: Optional outlet connector data for world coordinates
-    """
-    tol = 0.01
-
-    cv = fit.get('center_vertical', 0)
-    ch = fit.get('center_horizontal', 0)
-    top = fit.get('top', 0)
-    bottom = fit.get('bottom', 0)
-    right = fit.get('right', 0)
-    left = fit.get('left', 0)
-
-    rotated = False
-    vertical_axis_sign = 1
-    flow_sign = 1
-    if inlet_data and inlet_data.get('basis_x') and inlet_data.get('basis_y'):
-        bx = inlet_data['basis_x']
-        by = inlet_data['basis_y']
-        rotated = abs(bx.Z) > abs(by.Z) and abs(bx.Z) > 0.5
-        vertical_axis_sign = 1 if (bx.Z if rotated else by.Z) >= 0 else -1
-    if inlet_data and inlet_data.get('basis_z'):
-        bz = inlet_data['basis_z']
-        if abs(bz.X) >= abs(bz.Y):
-            flow_sign = 1 if bz.X >= 0 else -1
-        else:
-            flow_sign = 1 if bz.Y >= 0 else -1
-
-    def classify_vertical_part():
-        """Classify vertical component from raw fit using axis orientation."""
-        top_aligned = abs(top) < tol
-        bottom_aligned = abs(bottom) < tol
-
-        # Edge-aligned cases
-        if top_aligned and bottom_aligned:
-            if size_obj and size_obj.in_size == size_obj.out_size and abs(ch) >= tol:
-                return "FOT" if vertical_axis_sign > 0 else "FOB"
-            return "CL"
-        if top_aligned:
-            return "FOB" if flow_sign > 0 else "FOT"
-        if bottom_aligned:
-            return "FOT" if flow_sign > 0 else "FOB"
-
-        # Neither edge aligned: determine UP/DN
-        if abs(cv) < tol:
-            return "CL"
-
-        # Same-sign non-edge cases are orientation dependent.
-        if top * bottom > 0:
-            sign_source = 0.0
-            if inlet_data and inlet_data.get('basis_y'):
-                sign_source = inlet_data['basis_y'].Z
-            if abs(sign_source) < 0.001:
-                if rotated:
-                    by = inlet_data.get('basis_y') if inlet_data else None
-                    if by and (abs(by.Y) > abs(by.X)):
-                        direction = "UP" if by.Y > 0 else "DN"
-                    elif by:
-                        direction = "UP" if by.X > 0 else "DN"
-                    else:
-                        direction = "UP" if vertical_axis_sign < 0 else "DN"
-                    magnitude = max(abs(top), abs(bottom))
-                    return "{} {:.0f}".format(direction, magnitude)
-                sign_source = float(vertical_axis_sign)
-
-            if sign_source > 0:
-                direction = "UP"
-                magnitude = min(abs(top), abs(bottom))
-            else:
-                direction = "DN"
-                magnitude = max(abs(top), abs(bottom))
-        else:
-            # Mixed-sign edges require flow-aware interpretation.
-            # For one flow direction the near-edge value is the label,
-            # for the opposite flow direction the far-edge value is used.
-            if flow_sign > 0:
-                direction = "DN"
-                magnitude = min(abs(top), abs(bottom))
-            else:
-                direction = "UP"
-                magnitude = max(abs(top), abs(bottom))
-
-        return "{} {:.0f}".format(direction, magnitude)
-
-    def classify_horizontal_part():
-        """Classify horizontal component using rotated/non-rotated rules."""
-        if abs(left) < tol or abs(right) < tol:
-            if size_obj and size_obj.in_size == size_obj.out_size and abs(ch) >= tol:
-                direction = "IN" if (rotated and ch > 0) or (
-                    not rotated and ch < 0) else "OUT"
-                magnitude = max(abs(left), abs(right))
-                return "{}{:.0f}".format(direction, magnitude)
-            return "FOS"
-        if abs(ch) < tol:
-            return "CL"
-
-        if rotated:
-            direction = "IN" if ch > 0 else "OUT"
-        else:
-            direction = "OUT" if ch > 0 else "IN"
-
-        if left * right > 0:
-            if direction == "OUT":
-                magnitude = min(abs(left), abs(right))
-            else:
-                magnitude = max(abs(left), abs(right))
-        else:
-            magnitude = max(abs(left), abs(right))
-
-        return "{}{:.0f}".format(direction, magnitude)
-
-    # If top and bottom are both 0, it's just a horizontal offset
-    if abs(top) < tol and abs(bottom) < tol:
-        horizontal = classify_horizontal_part()
-        vertical = classify_vertical_part()
-        if vertical == "CL":
-            return horizontal
-        return "{}|{}".format(vertical, horizontal)
-
-    # If left and right are both 0, it's just a vertical offset
-    elif abs(left) < tol and abs(right) < tol:
-        vertical = classify_vertical_part()
-        return vertical
-
-    # Both vertical and horizontal
-    else:
-        vertical = classify_vertical_part()
-        horizontal = classify_horizontal_part()
-
-        if vertical == "CL" and horizontal == "CL":
-            return "CL"
-
-        return "{}|{}".format(vertical, horizontal)
 
 # Main Code
 # ======================================================================
@@ -291,68 +201,81 @@ if not selection:
         )
 
 else:
+    # Per-element details are optional; the summary is always printed
+    print_details = False
     if PRINT_OUTPUT:
+        print_details = forms.alert(
+            "Print per-element details?", ok=False, yes=True, no=True)
         output.print_md(
             "# Offset Information"
         )
 
-    processed = []
+    # Detailed report, collected while fittings are read
+    lines = []
     matched_count = 0
+    missing_size_count = 0
 
+    # Read and calculate every fitting before the document is opened for writes
+    pending = []
     for element in selection:
         try:
-            # Get family name and normalize
-            family_type = doc.GetElement(element.GetTypeId())
-            if not family_type:
+            # Get normalized family name, looked up once per type
+            family_name = get_family_name(element, family_name_cache)
+            if not family_name:
                 continue
 
-            family_name = family_type.FamilyName.lower()
-            family_name = family_name.replace('*', '').strip()
-
             if family_name not in family_list:
                 continue
 
             matched_count += 1
 
-            # Extract XYZ coordinates and orientation using RevitXYZ
-            xyz_extractor = RevitXYZ(element)
-            inlet_data, outlet_data = xyz_extractor.inlet_outlet_data()
-
-            if not inlet_data or not outlet_data:
-                continue
-
-            inlet = inlet_data['origin']
-            outlet = outlet_data['origin']
+            # Read every parameter this fitting needs in one scan
+            param_map = get_parameter_map(element, offset_parameter_names)
 
-            # Parse size from element parameter
-            size_param = element.LookupParameter("Size")
-            if not size_param:
+            # Parse size from element parameter; skip fittings without one
+            # before any connector geometry is read
+            size_param = param_map.get(RVT_SIZE)
+            size_str = size_param.AsString() if size_param else None
+            if not size_str:
+                missing_size_count += 1
                 continue
 
-            size_str = size_param.AsString()
-            size = Size(size_str)
+            size = get_size(size_str)
 
-            # Extract XYZ with size matching - re-extract with size info
+            # Extract inlet/outlet coordinates and orientation once, size-matched
+            xyz_extractor = RevitXYZ(element)
             inlet_data, outlet_data = xyz_extractor.inlet_outlet_data(size)
 
-            # Calculate offsets with new API
-            offsets_calc = Offsets(inlet_data, outlet_data, size)
-            fitting = offsets_calc.calculate()
+            if not inlet_data or not outlet_data:
+                continue
+
+            # Calculate and classify once per distinct fitting geometry
+            fitting, final_classification = calculate_offset(
+                inlet_data, outlet_data, size, offset_results)
 
             if fitting:
-                # Store for output
-                processed.append(
-                    (element, family_name, size_str, fitting, inlet_data, outlet_data))
+                pending.append(
+                    (element, param_map, fitting, final_classification))
+                if print_details:
+                    _append_report(lines, element, fitting, inlet_data,
+                                   outlet_data, size, final_classification)
 
-                # Calculate classification
-                classification = classify_offset(
-                    fitting, inlet_data, outlet_data, size)
+        except Exception as e:
+            if PRINT_OUTPUT:
+                output.print_md("ERROR: processing element {} : {}".format(
+                    element.Id.Value,
+                    str(e)
+                ))
 
-                # Write values to parameters
-                with revit.Transaction("Set Offset Parameters"):
+    # One transaction covers every write; skipped when nothing qualified
+    if pending:
+        with revit.Transaction("Set Offset Parameters"):
+            for element, param_map, fitting, final_classification in pending:
+                try:
+                    # Write values to parameters
                     for param_name, fitting_key in parameters.items():
                         if fitting_key in fitting:
-                            p = element.LookupParameter(param_name)
+                            p = param_map.get(param_name)
                             if p and not p.IsReadOnly:
                                 try:
                                     if p.StorageType == StorageType.Double:
@@ -368,146 +291,54 @@ else:
                         PYT_OFFSET_LEFT,
                         JG_OFFSET_LEFT,
                         source_inches=True,
+                        param_map=param_map,
                     )
                     _copy_param_value(
                         element,
                         PYT_OFFSET_RIGHT,
                         JG_OFFSET_RIGHT,
                         source_inches=True,
+                        param_map=param_map,
                     )
 
                     # Write classification to modern parameter first; fallback to legacy.
-                    final_classification = convert_to_TU_TD(classification)
-                    tag_p = (element.LookupParameter(PYT_OFFSET_VALUE) or
-                             element.LookupParameter(LEGACY_OFFSET))
+                    tag_p = (param_map.get(PYT_OFFSET_VALUE) or
+                             param_map.get(LEGACY_OFFSET))
                     if tag_p and not tag_p.IsReadOnly:
                         try:
                             if tag_p.StorageType == StorageType.String:
                                 current_value = tag_p.AsString()
                                 if current_value and current_value.strip():
-                                    import re
                                     result = current_value
-                                    numbers = re.findall(
-                                        r'\d+', final_classification or '')
-                                    if numbers:
-                                        for number in numbers:
-                                            result = re.sub(
-                                                r'\d+', number, result, count=1)
+                                    numbers = digit_pattern.findall(
+                                        final_classification or '')
+                                    for number in numbers:
+                                        result = digit_pattern.sub(
+                                            number, result, count=1)
+                                    # Skip the write when nothing changed
+                                    if result != current_value:
                                         tag_p.Set(result)
-                                    else:
-                                        tag_p.Set(current_value)
                                 else:
                                     tag_p.Set(final_classification)
                         except Exception:
                             pass
 
-        except Exception as e:
-            if PRINT_OUTPUT:
-                output.print_md("ERROR: processing element {} : {}".format(
-                    element.Id.Value,
-                    str(e)
-                ))
+                except Exception as e:
+                    if PRINT_OUTPUT:
+                        output.print_md("ERROR: processing element {} : {}".format(
+                            element.Id.Value,
+                            str(e)
+                        ))
 
     # Print detailed results
     if PRINT_OUTPUT:
-        for i, (elem, fam, size_str, fit, inlet_data, outlet_data) in enumerate(processed, start=1):
-            size = Size(size_str)
-            inlet = inlet_data['origin']
-            outlet = outlet_data['origin']
-            classification = convert_to_TU_TD(
-                classify_offset(fit, inlet_data, outlet_data, size))
-
-            output.print_md("# Element ID: {} | Category {}".format(
-                elem.Id.Value,
-                elem.Category.Name))
-
-            # General fitting information
-            output.print_md(
-                "### Size: {} | Inlet: {} | Outlet {}".format(
-                    size.size,
-                    size.in_size,
-                    size.out_size,
-                ))
-            output.print_md(
-                "### Inlet: {} | Shape: {} | W:{} H:{} D:{}".format(
-                    size.in_size,
-                    size.in_shape(),
-                    size.in_width,
-                    size.in_height,
-                    size.in_diameter,
-                ))
-            output.print_md(
-                "### Outlet: {} | Shape: {} | W:{} H:{} D:{}".format(
-                    size.out_size,
-                    size.out_shape(),
-                    size.out_width,
-                    size.out_height,
-                    size.out_diameter,
-                ))
-
-            # Coordinate
-            output.print_md("## **Coordinates**")
-            output.print_md(
-                "### Inlet: X: {:.3f}', Y: {:.3f}', Z: {:.3f}'".format(
-                    inlet.X,
-                    inlet.Y,
-                    inlet.Z,
-                ))
-            output.print_md(
-                "### Outlet: X: {:.3f}', Y: {:.3f}', Z: {:.3f}'".format(
-                    outlet.X,
-                    outlet.Y,
-                    outlet.Z,
-                ))
-
-            # Debug: Show basis vectors
-            output.print_md("## **Basis Vectors (Debug)**")
-            if inlet_data.get('basis_z'):
-                bz = inlet_data['basis_z']
-                output.print_md(
-                    "### Inlet Flow: X: {:.3f}, Y: {:.3f}, Z: {:.3f}".format(bz.X, bz.Y, bz.Z))
-            if outlet_data.get('basis_z'):
-                bz = outlet_data['basis_z']
-                output.print_md(
-                    "### Outlet Flow: X: {:.3f}, Y: {:.3f}, Z: {:.3f}".format(bz.X, bz.Y, bz.Z))
-            if inlet_data.get('basis_y'):
-                by = inlet_data['basis_y']
-                output.print_md(
-                    "### Inlet Up: X: {:.3f}, Y: {:.3f}, Z: {:.3f}".format(by.X, by.Y, by.Z))
-            if inlet_data.get('basis_x'):
-                bx = inlet_data['basis_x']
-                output.print_md(
-                    "### Inlet Right: X: {:.3f}, Y: {:.3f}, Z: {:.3f}".format(bx.X, bx.Y, bx.Z))
-
-            # Offset data
-            output.print_md("## Offset data")
-            order = [
-                "center_vertical",
-                "center_horizontal",
-                "top",
-                "bottom",
-                "right",
-                "left",
-            ]
-
-            for key in order:
-                if key in fit:
-                    output.print_md("### {} | '{:.3f}'".format(
-                        key,
-                        fit[key],
-                    ))
-
-            # Add _duct_note parameter
-            note_param = elem.LookupParameter('_duct_note')
-            if note_param:
-                note_value = note_param.AsString()
-                output.print_md("### _duct_note | '{}'".format(note_value))
-
-            # Add classification
-            output.print_md("## Classification")
-            output.print_md("### {}".format(classification))
+        if lines:
+            output.print_md("\n\n".join(lines))
 
         output.print_md("---")
         output.print_md(
             "# Summary: {} offset fittings processed, {} parameters updated".format(
-                matched_count, len(processed)))
+                matched_count, len(pending)))
+        if missing_size_count:
+            output.print_md(
+                "# Skipped: {} fittings without a Size".format(missing_size_count))
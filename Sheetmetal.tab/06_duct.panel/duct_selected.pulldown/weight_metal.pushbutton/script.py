@@ -25,6 +25,7 @@ uidoc = __revit__.ActiveUIDocument  # type: UIDocument
 doc = revit.doc  # type: Document
 view = revit.active_view
 output = script.get_output()
+max_summary_links = 20
 
 # Main Code
 # ==================================================
@@ -37,32 +38,43 @@ if ducts:
     output.print_md('# Selected {} joints of duct'.format(len(ducts)))
     output.print_md('---')
 
-    # Individual properties
+    # Individual properties and running totals, reading each duct once
+    element_ids = []
+    total_weight = 0.0
+    total_length_in = 0.0
+    lines = []
+    row_template = '### No: {:03} | ID: {} | Weight: {:06.2f}lbs | Length: {:06.2f}" | Size: {} | Family: {}'
     for i, d in enumerate(ducts, start=1):
+        weight = d.weight
+        length = d.length
+        element_ids.append(d.element.Id)
+        if weight is not None and length is not None:
+            total_weight += weight
+            total_length_in += length
         if len(ducts) < 501:
-            output.print_md(
-                '### No: {:03} | ID: {} | Weight: {:06.2f}lbs | Length: {:06.2f}" | Size: {} | Family: {}'.format(
-                    i,
-                    output.linkify(d.element.Id),
-                    d.weight,
-                    d.length,
-                    d.size,
-                    d.family
-                )
-            )
+            lines.append(row_template.format(
+                i,
+                output.linkify(d.element.Id),
+                weight,
+                length,
+                d.size,
+                d.family
+            ))
+    if lines:
+        output.print_md('\n\n'.join(lines))
 
-    # Final totals loop and link
-    element_ids = [d.element.Id for d in ducts]
-    pairs = [(d.weight, d.length)
-             for d in ducts if d.weight is not None and d.length is not None]
-    total_weight = sum(w for w, _ in pairs)
-    total_length_in = sum(l for _, l in pairs)
+    # Final totals and link, listing only the first few ids
     weight_per_ft = (total_weight / (total_length_in / 12.0)
                      ) if total_length_in else 0.0
+    shown = element_ids[:max_summary_links]
+    extra = len(element_ids) - len(shown)
+    tail = u' \u2026+{} more ({})'.format(
+        extra, output.linkify(element_ids, title='select all')) if extra > 0 else ''
     output.print_md(
-        '# Total elements: {} | IDs: {} | Total weight: {:.2f} lbs | Weight/ft: {:.2f}'.format(
+        u'# Total elements: {} | IDs: {}{} | Total weight: {:.2f} lbs | Weight/ft: {:.2f}'.format(
             len(element_ids),
-            output.linkify(element_ids),
+            output.linkify(shown),
+            tail,
             total_weight,
             weight_per_ft
         )
@@ -10,7 +10,7 @@ the copyright holder."""
 # Imports
 # ==================================================
 from ducts.revit_duct import RevitDuct
-from geometry.size import Size
+from geometry.size import get_size
 from Autodesk.Revit.DB import Transaction
 from pyrevit import revit, script
 
@@ -58,7 +58,7 @@ if not all_straights:
 # ==================================================
 def calculate_aspect_ratio(size_str):
     try:
-        size = Size(size_str)
+        size = get_size(size_str)
 
         # Get width and height
         width = size.in_width
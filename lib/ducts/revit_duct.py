@@ -10,7 +10,7 @@ the copyright holder.
 # Standard library
 # =========================================================
 from ducts.revit_xyz import RevitXYZ
-from geometry.size import Size
+from geometry.size import get_size
 from geometry.offsets import Offsets
 from Autodesk.Revit.DB import (
     ElementId,
@@ -183,6 +183,12 @@ class RevitDuct:
             # deterministic
             return None
 
+    def _size_obj(self, size_str=None):
+        """Return the parsed Size for this duct, shared per size string."""
+        if size_str is None:
+            size_str = self.size
+        return get_size(size_str)
+
     def _inlet_outlet_from_revit_xyz(self):
         """Get inlet/outlet data via RevitXYZ (connector-based, no curve helper)."""
         xyz_extractor = RevitXYZ(self.element)
@@ -191,68 +197,48 @@ class RevitDuct:
             return inlet_data, outlet_data
         return None, None
 
+    def _offset_fit(self):
+        """Calculate offsets once per wrapper; every offset_* reads the result."""
+        if not hasattr(self, '_offset_result'):
+            self._offset_result = None
+            inlet_data, outlet_data = self._inlet_outlet_from_revit_xyz()
+            if inlet_data and outlet_data:
+                offsets_obj = Offsets(inlet_data, outlet_data, self._size_obj())
+                self._offset_result = offsets_obj.calculate()
+        return self._offset_result
+
     @property
     def size(self):
         return self._get_param(RVT_SIZE)
 
     @property
     def offset_top(self):
-        inlet_data, outlet_data = self._inlet_outlet_from_revit_xyz()
-        if not inlet_data or not outlet_data:
-            return None
-
-        offsets_obj = Offsets(inlet_data, outlet_data, Size(self.size))
-        result = offsets_obj.calculate()
+        result = self._offset_fit()
         return result['top'] if result else None
 
     @property
     def offset_bottom(self):
-        inlet_data, outlet_data = self._inlet_outlet_from_revit_xyz()
-        if not inlet_data or not outlet_data:
-            return None
-
-        offsets_obj = Offsets(inlet_data, outlet_data, Size(self.size))
-        result = offsets_obj.calculate()
+        result = self._offset_fit()
         return result['bottom'] if result else None
 
     @property
     def offset_left(self):
-        inlet_data, outlet_data = self._inlet_outlet_from_revit_xyz()
-        if not inlet_data or not outlet_data:
-            return None
-
-        offsets_obj = Offsets(inlet_data, outlet_data, Size(self.size))
-        result = offsets_obj.calculate()
+        result = self._offset_fit()
         return result['left'] if result else None
 
     @property
     def offset_right(self):
-        inlet_data, outlet_data = self._inlet_outlet_from_revit_xyz()
-        if not inlet_data or not outlet_data:
-            return None
-
-        offsets_obj = Offsets(inlet_data, outlet_data, Size(self.size))
-        result = offsets_obj.calculate()
+        result = self._offset_fit()
         return result['right'] if result else None
 
     @property
     def offset_center_h(self):
-        inlet_data, outlet_data = self._inlet_outlet_from_revit_xyz()
-        if not inlet_data or not outlet_data:
-            return None
-
-        offsets_obj = Offsets(inlet_data, outlet_data, Size(self.size))
-        result = offsets_obj.calculate()
+        result = self._offset_fit()
         return result['center_horizontal'] if result else None
 
     @property
     def offset_center_v(self):
-        inlet_data, outlet_data = self._inlet_outlet_from_revit_xyz()
-        if not inlet_data or not outlet_data:
-            return None
-
-        offsets_obj = Offsets(inlet_data, outlet_data, Size(self.size))
-        result = offsets_obj.calculate()
+        result = self._offset_fit()
         return result['center_vertical'] if result else None
 
     @property
@@ -279,7 +265,7 @@ class RevitDuct:
     def size_in(self):
         size_str = self.size
         if size_str:
-            size_obj = Size(size_str)
+            size_obj = self._size_obj(size_str)
             if size_obj.in_size is not None:
                 return size_obj.in_size
 
@@ -287,7 +273,7 @@ class RevitDuct:
     def size_out(self):
         size_str = self.size
         if size_str:
-            size_obj = Size(size_str)
+            size_obj = self._size_obj(size_str)
             if size_obj.out_size is not None:
                 return size_obj.out_size
 
@@ -295,7 +281,7 @@ class RevitDuct:
     def diameter_in(self):
         size_str = self.size
         if size_str:
-            size_obj = Size(size_str)
+            size_obj = self._size_obj(size_str)
             if size_obj.in_diameter is not None:
                 return size_obj.in_diameter
 
@@ -306,7 +292,7 @@ class RevitDuct:
     def diameter_out(self):
         size_str = self.size
         if size_str:
-            size_obj = Size(size_str)
+            size_obj = self._size_obj(size_str)
             if size_obj.out_diameter is not None:
                 return size_obj.out_diameter
 
@@ -317,7 +303,7 @@ class RevitDuct:
     def height_in(self):
         size_str = self.size
         if size_str:
-            size_obj = Size(size_str)
+            size_obj = self._size_obj(size_str)
             if size_obj.in_height is not None:
                 return size_obj.in_height
 
@@ -328,7 +314,7 @@ class RevitDuct:
     def width_in(self):
         size_str = self.size
         if size_str:
-            size_obj = Size(size_str)
+            size_obj = self._size_obj(size_str)
             if size_obj.in_width is not None:
                 return size_obj.in_width
 
@@ -339,7 +325,7 @@ class RevitDuct:
     def width_out(self):
         size_str = self.size
         if size_str:
-            size_obj = Size(size_str)
+            size_obj = self._size_obj(size_str)
             if size_obj.out_width is not None:
                 return size_obj.out_width
 
@@ -350,7 +336,7 @@ class RevitDuct:
     def height_out(self):
         size_str = self.size
         if size_str:
-            size_obj = Size(size_str)
+            size_obj = self._size_obj(size_str)
             if size_obj.out_height is not None:
                 return size_obj.out_height
 
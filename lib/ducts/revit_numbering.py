@@ -9,6 +9,7 @@ the copyright holder.
 
 import math
 import re
+from collections import deque
 
 from config.parameters_registry import (
     PYT_NUMBER_ORDER,
@@ -20,11 +21,16 @@ from config.parameters_registry import (
     RVT_LENGTH,
     RVT_SIZE,
 )
-from Autodesk.Revit.DB import FabricationPart, StorageType
+from Autodesk.Revit.DB import (
+    BuiltInCategory,
+    FabricationPart,
+    FilteredElementCollector,
+    StorageType,
+)
 from pyrevit import revit, script
 
 from ducts.revit_duct import RevitDuct
-from geometry.size import Size
+from geometry.size import get_size
 
 #fmt: off
 #autopep8: off
@@ -164,7 +170,7 @@ class RevitNumbers(object):
         if not size_str:
             return None
 
-        size_obj = Size(size_str)
+        size_obj = get_size(size_str)
 
         if size_obj.in_diameter is not None:
             return ("round", round(float(size_obj.in_diameter), 4))
@@ -337,12 +343,18 @@ class RevitNumbers(object):
         use_project_scope = scope_value in ("project", "all", "all_project")
         target_view = None if use_project_scope else (view_obj or self.view)
 
-        ducts = RevitDuct.all(self.doc, target_view)
+        collector = (FilteredElementCollector(self.doc, target_view.Id)
+                     if target_view else FilteredElementCollector(self.doc))
+        elements = (collector
+                    .OfCategory(BuiltInCategory.OST_FabricationDuctwork)
+                    .WhereElementIsNotElementType()
+                    .ToElements())
 
+        # Wrap only the elements that carry an order value
         filtered = []
-        for duct in ducts:
+        for element in elements:
             try:
-                param = duct.element.LookupParameter(PYT_NUMBER_ORDER)
+                param = element.LookupParameter(PYT_NUMBER_ORDER)
                 if not param:
                     continue
 
@@ -358,7 +370,7 @@ class RevitNumbers(object):
                     value = param.AsValueString()
 
                 if value is not None and str(value).strip() != "":
-                    filtered.append(duct)
+                    filtered.append(RevitDuct(self.doc, target_view, element))
             except Exception:
                 continue
 
@@ -838,8 +850,9 @@ class RevitNumbers(object):
 
         return updated
 
-    def _get_connected_fittings(self, duct):
+    def _get_connected_fittings(self, duct, wrapper_cache=None):
         # Query Revit connectors directly for immediate neighbors
+        # wrapper_cache maps element id -> RevitDuct, or None when it stops the run
         connected = []
         for connector in duct.get_connectors():
             try:
@@ -858,6 +871,13 @@ class RevitNumbers(object):
                 if connected_el.Id == duct.element.Id:
                     continue
 
+                key = connected_el.Id.Value
+                if wrapper_cache is not None and key in wrapper_cache:
+                    connected_duct = wrapper_cache[key]
+                    if connected_duct is not None:
+                        connected.append(connected_duct)
+                    continue
+
                 try:
                     connected_duct = RevitDuct(
                         self.doc,
@@ -865,27 +885,33 @@ class RevitNumbers(object):
                         connected_el,
                     )
                     if self.has_stop_value(connected_duct):
-                        continue
-                    connected.append(connected_duct)
+                        connected_duct = None
                 except Exception:
-                    continue
+                    connected_duct = None
+
+                if wrapper_cache is not None:
+                    wrapper_cache[key] = connected_duct
+                if connected_duct is not None:
+                    connected.append(connected_duct)
 
         return connected
 
     def build_connectivity_map(self, start_duct):
         # Build a full adjacency map once so downstream traversal avoids repeated API scans
+        # One wrapper per element is shared by every neighbor list in the map
         connectivity_map = {}
-        to_process = [start_duct]
+        wrapper_cache = {}
+        to_process = deque([start_duct])
         visited = set()
 
         while to_process:
-            current = to_process.pop(0)
+            current = to_process.popleft()
             if current.id in visited:
                 continue
 
             visited.add(current.id)
 
-            neighbors = self._get_connected_fittings(current)
+            neighbors = self._get_connected_fittings(current, wrapper_cache)
             connectivity_map[current.id] = neighbors
 
             for neighbor in neighbors:
@@ -1198,9 +1224,8 @@ class RevitNumbers(object):
                                    previous_signature,
                                    repeat_numbers=False):
 
-        current_signature = self.get_match_signature(duct)
-
         if not repeat_numbers:
+            current_signature = self.get_match_signature(duct)
             assigned_number = current_number
             current_number += 1
         else:
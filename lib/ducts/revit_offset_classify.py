@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+"""=========================================================================
+Copyright (c) 2025 Jose Francisco Nava Perez. All rights reserved.
+
+This code and associated documentation files may not be copied, modified,
+distributed, or used in any form without the prior written permission of
+the copyright holder.
+========================================================================="""
+
+# Standard library
+# =========================================================
+import re
+
+from config.parameters_registry import *
+from geometry.offsets import Offsets
+
+
+# Offset parameters and the fitting keys written to them
+# =========================================================
+parameters = {
+    PYT_OFFSET_CENTER_H: 'center_horizontal',
+    PYT_OFFSET_CENTER_V: 'center_vertical',
+    PYT_OFFSET_TOP: 'top',
+    PYT_OFFSET_BOTTOM: 'bottom',
+    PYT_OFFSET_RIGHT: 'right',
+    PYT_OFFSET_LEFT: 'left',
+}
+
+
+# Patterns used to convert classifications to the TU/TD tag scheme
+vertical_token_pattern = re.compile(r'\b(UP|DN)\s*\d+')
+up_pattern = re.compile(r'\bUP\s*(\d+)\b')
+dn_pattern = re.compile(r'\bDN\s*(\d+)\b')
+tu_pattern = re.compile(r'\bTU(\d+)(?:[↑↓])?')
+td_pattern = re.compile(r'\bTD(\d+)(?:[↑↓])?')
+digit_pattern = re.compile(r'\d+')
+
+
+# Helpers
+# =========================================================
+
+
+def get_parameter_map(element, parameter_names):
+    """Return {name: parameter} for the wanted names from one parameter scan."""
+    param_map = {}
+    for param in element.Parameters:
+        name = param.Definition.Name
+        if name in parameter_names and name not in param_map:
+            param_map[name] = param
+    return param_map
+
+
+def get_family_name(element, cache):
+    """Return the normalized family name for element, cached per type."""
+    type_id = element.GetTypeId()
+    if type_id in cache:
+        return cache[type_id]
+    family_type = element.Document.GetElement(type_id)
+    family_name = None
+    if family_type:
+        # Trim spaces/asterisks so *Reducer * matches 'reducer'
+        family_name = family_type.FamilyName.lower().replace('*', '').strip()
+    cache[type_id] = family_name
+    return family_name
+
+
+def should_add_tag_prefix(classification):
+    """Check if classification contains vertical UP/DN with numbers.
+
+    Historically used to decide adding T: prefix. Kept for
+    compatibility, now simply signals when UP/DN digits are present so
+    we can convert to TU/TD format.
+    """
+    # Check if it contains UP or DN followed by a number (no space)
+    if vertical_token_pattern.search(classification):
+        return True
+    return False
+
+
+def convert_to_TU_TD(value):
+    """Convert any 'T:UPn'/'T:DNn' or 'UP n'/'DN n' to 'TUn'/'TDn'.
+
+    - Removes any leading 'T:' marker
+    - Replaces vertical tokens:
+        'UP12' or 'UP 12' -> 'TU12'
+        'DN6'  or 'DN 6'  -> 'TD6'
+    - Leaves other tokens (CL, FOB, FOT, IN, OUT, FOR, FOL) unchanged
+    - Works within combined strings like 'UP12|IN5'
+    """
+    try:
+        if value is None:
+            return value
+        s = value.strip()
+        # drop optional leading T:
+        if s.startswith('T:'):
+            s = s[2:]
+        # normalize spaces around vertical tokens and convert, append arrows
+        s = up_pattern.sub(r'TU\1', s)
+        s = dn_pattern.sub(r'TD\1', s)
+        # ensure arrows for TU/TD exactly once
+        s = tu_pattern.sub(r'TU\1↑', s)
+        s = td_pattern.sub(r'TD\1↓', s)
+        return s
+    except Exception:
+        return value
+
+
+def classify_offset(fit, inlet_data=None, outlet_data=None, size_obj=None):
+    """Classify offset values - vertical | horizontal.
+
+    Vertical: FOB, FOT, CL, UP, DN
+    Horizontal: FOL, FOR, CL, IN, OUT
+
+    If top and bottom are both 0, just return horizontal.
+    If left and right are both 0, just return vertical.
+    If both are CL, return just CL.
+
+    Args:
+        fit: Dictionary with offset values
+        inlet_data: Optional inlet connector data with basis vectors to normalize orientation
+        outlet_data: Optional outlet connector data for world coordinates
+    """
+    tol = 0.01
+
+    cv = fit.get('center_vertical', 0)
+    ch = fit.get('center_horizontal', 0)
+    top = fit.get('top', 0)
+    bottom = fit.get('bottom', 0)
+    right = fit.get('right', 0)
+    left = fit.get('left', 0)
+
+    # Magnitudes are compared repeatedly below; take them once
+    abs_cv = abs(cv)
+    abs_ch = abs(ch)
+    abs_top = abs(top)
+    abs_bottom = abs(bottom)
+    abs_right = abs(right)
+    abs_left = abs(left)
+
+    rotated = False
+    vertical_axis_sign = 1
+    flow_sign = 1
+    if inlet_data and inlet_data.get('basis_x') and inlet_data.get('basis_y'):
+        bx = inlet_data['basis_x']
+        by = inlet_data['basis_y']
+        rotated = abs(bx.Z) > abs(by.Z) and abs(bx.Z) > 0.5
+        vertical_axis_sign = 1 if (bx.Z if rotated else by.Z) >= 0 else -1
+    if inlet_data and inlet_data.get('basis_z'):
+        bz = inlet_data['basis_z']
+        if abs(bz.X) >= abs(bz.Y):
+            flow_sign = 1 if bz.X >= 0 else -1
+        else:
+            flow_sign = 1 if bz.Y >= 0 else -1
+
+    def classify_vertical_part():
+        """Classify vertical component from raw fit using axis orientation."""
+        top_aligned = abs_top < tol
+        bottom_aligned = abs_bottom < tol
+
+        # Edge-aligned cases
+        if top_aligned and bottom_aligned:
+            if size_obj and size_obj.in_size == size_obj.out_size and abs_ch >= tol:
+                return "FOT" if vertical_axis_sign > 0 else "FOB"
+            return "CL"
+        if top_aligned:
+            return "FOB" if flow_sign > 0 else "FOT"
+        if bottom_aligned:
+            return "FOT" if flow_sign > 0 else "FOB"
+
+        # Neither edge aligned: determine UP/DN
+        if abs_cv < tol:
+            return "CL"
+
+        # Same-sign non-edge cases are orientation dependent.
+        if top * bottom > 0:
+            sign_source = 0.0
+            if inlet_data and inlet_data.get('basis_y'):
+                sign_source = inlet_data['basis_y'].Z
+            if abs(sign_source) < 0.001:
+                if rotated:
+                    by = inlet_data.get('basis_y') if inlet_data else None
+                    if by and (abs(by.Y) > abs(by.X)):
+                        direction = "UP" if by.Y > 0 else "DN"
+                    elif by:
+                        direction = "UP" if by.X > 0 else "DN"
+                    else:
+                        direction = "UP" if vertical_axis_sign < 0 else "DN"
+                    magnitude = max(abs_top, abs_bottom)
+                    return "{} {:.0f}".format(direction, magnitude)
+                sign_source = float(vertical_axis_sign)
+
+            if sign_source > 0:
+                direction = "UP"
+                magnitude = min(abs_top, abs_bottom)
+            else:
+                direction = "DN"
+                magnitude = max(abs_top, abs_bottom)
+        else:
+            # Mixed-sign edges require flow-aware interpretation.
+            # For one flow direction the near-edge value is the label,
+            # for the opposite flow direction the far-edge value is used.
+            if flow_sign > 0:
+                direction = "DN"
+                magnitude = min(abs_top, abs_bottom)
+            else:
+                direction = "UP"
+                magnitude = max(abs_top, abs_bottom)
+
+        return "{} {:.0f}".format(direction, magnitude)
+
+    def classify_horizontal_part():
+        """Classify horizontal component using rotated/non-rotated rules."""
+        if abs_left < tol or abs_right < tol:
+            if size_obj and size_obj.in_size == size_obj.out_size and abs_ch >= tol:
+                direction = "IN" if (rotated and ch > 0) or (
+                    not rotated and ch < 0) else "OUT"
+                magnitude = max(abs_left, abs_right)
+                return "{}{:.0f}".format(direction, magnitude)
+            return "FOS"
+        if abs_ch < tol:
+            return "CL"
+
+        if rotated:
+            direction = "IN" if ch > 0 else "OUT"
+        else:
+            direction = "OUT" if ch > 0 else "IN"
+
+        if left * right > 0:
+            if direction == "OUT":
+                magnitude = min(abs_left, abs_right)
+            else:
+                magnitude = max(abs_left, abs_right)
+        else:
+            magnitude = max(abs_left, abs_right)
+
+        return "{}{:.0f}".format(direction, magnitude)
+
+    # If top and bottom are both 0, it's just a horizontal offset
+    if abs_top < tol and abs_bottom < tol:
+        horizontal = classify_horizontal_part()
+        vertical = classify_vertical_part()
+        if vertical == "CL":
+            return horizontal
+        return "{}|{}".format(vertical, horizontal)
+
+    # If left and right are both 0, it's just a vertical offset
+    elif abs_left < tol and abs_right < tol:
+        vertical = classify_vertical_part()
+        return vertical
+
+    # Both vertical and horizontal
+    else:
+        vertical = classify_vertical_part()
+        horizontal = classify_horizontal_part()
+
+        if vertical == "CL" and horizontal == "CL":
+            return "CL"
+
+        return "{}|{}".format(vertical, horizontal)
+
+
+def _rounded_xyz(xyz):
+    return (round(xyz.X, 6), round(xyz.Y, 6), round(xyz.Z, 6)) if xyz else None
+
+
+def offset_signature(inlet_data, outlet_data, size_obj):
+    """Return a hashable key for everything the offset math depends on.
+
+    Offsets and classification only use the inlet-to-outlet displacement,
+    the inlet basis vectors and the size string, so fittings that repeat
+    the same geometry anywhere in the model share one signature.
+    """
+    inlet = inlet_data.get('origin')
+    outlet = outlet_data.get('origin')
+    if not inlet or not outlet:
+        return None
+    return (
+        size_obj.size,
+        _rounded_xyz(outlet - inlet),
+        _rounded_xyz(inlet_data.get('basis_x')),
+        _rounded_xyz(inlet_data.get('basis_y')),
+        _rounded_xyz(inlet_data.get('basis_z')),
+    )
+
+
+def calculate_offset(inlet_data, outlet_data, size_obj, cache=None):
+    """Return (fitting, TU/TD classification), memoized by offset_signature."""
+    key = None
+    if cache is not None:
+        key = offset_signature(inlet_data, outlet_data, size_obj)
+        if key is not None and key in cache:
+            return cache[key]
+
+    fitting = Offsets(inlet_data, outlet_data, size_obj).calculate()
+    final_classification = None
+    if fitting:
+        classification = classify_offset(
+            fitting, inlet_data, outlet_data, size_obj)
+        # Convert the new classification to TU/TD scheme
+        final_classification = convert_to_TU_TD(classification)
+
+    if key is not None:
+        cache[key] = (fitting, final_classification)
+    return fitting, final_classification
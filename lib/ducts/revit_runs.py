@@ -23,7 +23,7 @@ from Autodesk.Revit.DB import FabricationPart, StorageType
 from pyrevit import revit, script
 
 from ducts.revit_duct import RevitDuct
-from geometry.size import Size
+from geometry.size import get_size
 
 
 revit_host = globals().get("__revit__")
@@ -145,7 +145,7 @@ class RevitRuns(object):
         if not size_str:
             return None
 
-        size_obj = Size(size_str)
+        size_obj = get_size(size_str)
 
         if size_obj.in_diameter is not None:
             return ("round", round(float(size_obj.in_diameter), 4))
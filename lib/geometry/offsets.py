@@ -7,10 +7,6 @@ distributed, or used in any form without the prior written permission of
 the copyright holder.
 ========================================================================="""
 
-# Imports
-# =========================================================================
-from geometry.xyz import XYZ
-
 # Class
 # =========================================================================
 
@@ -41,109 +37,70 @@ class Offsets:
         if not inlet_origin or not outlet_origin:
             return None
 
-        # Convert Revit XYZ to custom XYZ for Points class (feet to inches)
-        inlet_pt = XYZ(
-            inlet_origin.X * 12, inlet_origin.Y * 12, inlet_origin.Z * 12)
-        outlet_pt = XYZ(
-            outlet_origin.X * 12, outlet_origin.Y * 12, outlet_origin.Z * 12)
+        # Center displacement in inches, reading each Revit XYZ component once
+        cx = outlet_origin.X * 12 - inlet_origin.X * 12
+        cy = outlet_origin.Y * 12 - inlet_origin.Y * 12
+        cz = outlet_origin.Z * 12 - inlet_origin.Z * 12
 
-        # Determine if duct is rotated (width/height may be swapped)
-        # Check which dimension of the duct aligns with vertical
-        if inlet_basis_x and inlet_basis_y:
-            bx_z = abs(inlet_basis_x.Z)
-            by_z = abs(inlet_basis_y.Z)
+        # Basis vectors as plain (x, y, z) tuples
+        has_basis = bool(inlet_basis_x and inlet_basis_y)
+        rotated = False
+        if has_basis:
+            bx = (inlet_basis_x.X, inlet_basis_x.Y, inlet_basis_x.Z)
+            by = (inlet_basis_y.X, inlet_basis_y.Y, inlet_basis_y.Z)
 
             # If basis_x is more vertical, the duct is rotated 90° (width is vertical)
-            if bx_z > by_z and bx_z > 0.5:
-                # Duct rotated - swap width/height
-                in_w = self.size.in_height if self.size.in_height else 0
-                in_h = self.size.in_width if self.size.in_width else 0
-                out_w = self.size.out_height if self.size.out_height else 0
-                out_h = self.size.out_width if self.size.out_width else 0
-            else:
-                # Normal orientation
-                in_w = self.size.in_width if self.size.in_width else 0
-                in_h = self.size.in_height if self.size.in_height else 0
-                out_w = self.size.out_width if self.size.out_width else 0
-                out_h = self.size.out_height if self.size.out_height else 0
+            bx_z = abs(bx[2])
+            by_z = abs(by[2])
+            rotated = bx_z > by_z and bx_z > 0.5
+
+        size = self.size
+        if rotated:
+            # Duct rotated - swap width/height
+            in_w = size.in_height or 0
+            in_h = size.in_width or 0
+            out_w = size.out_height or 0
+            out_h = size.out_width or 0
         else:
-            in_w = self.size.in_width if self.size.in_width else 0
-            in_h = self.size.in_height if self.size.in_height else 0
-            out_w = self.size.out_width if self.size.out_width else 0
-            out_h = self.size.out_height if self.size.out_height else 0
+            in_w = size.in_width or 0
+            in_h = size.in_height or 0
+            out_w = size.out_width or 0
+            out_h = size.out_height or 0
 
         # Half-sizes (inches)
         def halves(shape, w, h, d):
             if shape == "round":
                 r = (d or 0) / 2.0
                 return r, r
-            if shape == "oval":
-                return (w or 0) / 2.0, (h or 0) / 2.0
             return (w or 0) / 2.0, (h or 0) / 2.0
 
-        in_shape = self.size.in_shape()
-        out_shape = self.size.out_shape()
         in_half_w, in_half_h = halves(
-            in_shape, in_w, in_h, self.size.in_diameter)
+            size.in_shape(), in_w, in_h, size.in_diameter)
         out_half_w, out_half_h = halves(
-            out_shape, out_w, out_h, self.size.out_diameter)
-
-        # Center displacement
-        center_vec = outlet_pt - inlet_pt
-
-        # Project onto global axes for consistent measurements
-        # Vertical is always Z-axis (up/down)
-        center_v = center_vec.Z
-
-        # Horizontal: project onto XY plane and decompose into perpendicular directions
-        # We need to measure offset relative to the duct's orientation, not flow direction
-        # Use basis vectors if available to determine duct orientation
-        if inlet_basis_x and inlet_basis_y:
-            # Use actual duct orientation from connectors
-            bx = XYZ(inlet_basis_x.X, inlet_basis_x.Y, inlet_basis_x.Z)
-            by = XYZ(inlet_basis_y.X, inlet_basis_y.Y, inlet_basis_y.Z)
-
-            # Project center_vec onto these basis directions
-            # But map them to vertical/horizontal based on their alignment with global Z
-            bx_z = abs(bx.Z)
-            by_z = abs(by.Z)
-
-            # Keep the vertical local axis aligned with world-up.
-            # Without this, some fittings report inverted top/bottom when
-            # connector coordinate systems are reversed.
-            vertical_is_bx = bx_z > by_z and bx_z > 0.5
-            vertical_axis = bx if vertical_is_bx else by
-            if vertical_axis.Z < 0:
-                bx = bx * -1
-                by = by * -1
-
-            if bx_z > by_z and bx_z > 0.5:
+            size.out_shape(), out_w, out_h, size.out_diameter)
+
+        if has_basis:
+            # Measure relative to the duct's orientation, not flow direction.
+            # Keep the vertical local axis aligned with world-up; without
+            # this, some fittings report inverted top/bottom when connector
+            # coordinate systems are reversed.
+            vertical_axis = bx if rotated else by
+            sign = -1 if vertical_axis[2] < 0 else 1
+            dot_x = cx * bx[0] * sign + cy * bx[1] * sign + cz * bx[2] * sign
+            dot_y = cx * by[0] * sign + cy * by[1] * sign + cz * by[2] * sign
+
+            if rotated:
                 # basis_x is vertical (duct rotated 90°)
-                center_h = center_vec.dot(by)
-                center_v = center_vec.dot(bx)
-                # Swap dimensions
-                in_w = self.size.in_height if self.size.in_height else 0
-                in_h = self.size.in_width if self.size.in_width else 0
-                out_w = self.size.out_height if self.size.out_height else 0
-                out_h = self.size.out_width if self.size.out_width else 0
+                center_h = dot_y
+                center_v = dot_x
             else:
                 # Normal: basis_y is vertical (or more vertical)
-                center_h = center_vec.dot(bx)
-                center_v = center_vec.dot(by)
-                in_w = self.size.in_width if self.size.in_width else 0
-                in_h = self.size.in_height if self.size.in_height else 0
-                out_w = self.size.out_width if self.size.out_width else 0
-                out_h = self.size.out_height if self.size.out_height else 0
+                center_h = dot_x
+                center_v = dot_y
         else:
-            # No basis vectors - use global coordinates
-            # Vertical is Z
-            center_v = center_vec.Z
-            # Horizontal magnitude in XY plane
-            center_h = (center_vec.X ** 2 + center_vec.Y ** 2) ** 0.5
-            in_w = self.size.in_width if self.size.in_width else 0
-            in_h = self.size.in_height if self.size.in_height else 0
-            out_w = self.size.out_width if self.size.out_width else 0
-            out_h = self.size.out_height if self.size.out_height else 0
+            # No basis vectors - vertical is Z, horizontal is the XY magnitude
+            center_v = cz
+            center_h = (cx ** 2 + cy ** 2) ** 0.5
 
         top_val = center_v + (out_half_h - in_half_h)
         bottom_val = center_v - (out_half_h - in_half_h)
@@ -11,6 +11,14 @@ the copyright holder.
 # ========================================================================
 import re
 
+# Size token patterns, compiled once per session
+round_pattern = re.compile(r'(\d+(?:\.\d+)?)(?:\s+(\d+)/(\d+))?\s*[øØ]')
+oval_slash_pattern = re.compile(r'(\d+(?:\.\d+)?)\s*/\s*(\d+(?:\.\d+)?)')
+oval_x_pattern = re.compile(
+    r'(\d+(?:\.\d+)?)\s*"?\s*[x×]\s*"?\s*(\d+(?:\.\d+)?)\s*"?\s*[øØ]')
+rect_pattern = re.compile(
+    r'(\d+(?:\.\d+)?)\s*"?\s*[x×]\s*"?\s*(\d+(?:\.\d+)?)\s*"?')
+
 
 class Size:
     def __init__(self, size):
@@ -60,7 +68,7 @@ class Size:
             return result
 
         # Logic for rounds, allowing mixed fractions (e.g., 10 1/8ø)
-        m = re.match(r'(\d+(?:\.\d+)?)(?:\s+(\d+)/(\d+))?\s*[øØ]', token)
+        m = round_pattern.match(token)
         if m:
             base = float(m.group(1))
             if m.group(2) and m.group(3):
@@ -74,7 +82,7 @@ class Size:
             return result
 
         # Logic for ovals with slash (e.g., 24/12)
-        m = re.match(r'(\d+(?:\.\d+)?)\s*/\s*(\d+(?:\.\d+)?)', token)
+        m = oval_slash_pattern.match(token)
         if m:
             w = float(m.group(1))
             h = float(m.group(2))
@@ -86,8 +94,7 @@ class Size:
             return result
 
         # Logic for ovals marked with x/× with Ø suffix (e.g., 24x12Ø, 24"x12"Ø)
-        m = re.match(
-            r'(\d+(?:\.\d+)?)\s*"?\s*[x×]\s*"?\s*(\d+(?:\.\d+)?)\s*"?\s*[øØ]', token)
+        m = oval_x_pattern.match(token)
         if m:
             w = float(m.group(1))
             h = float(m.group(2))
@@ -100,8 +107,7 @@ class Size:
             return result
 
         # Logic for rectangle / square
-        m = re.match(
-            r'(\d+(?:\.\d+)?)\s*"?\s*[x×]\s*"?\s*(\d+(?:\.\d+)?)\s*"?', token)
+        m = rect_pattern.match(token)
         if m:
             result['width'] = float(m.group(1))
             result['height'] = float(m.group(2))
@@ -130,6 +136,19 @@ class Size:
             return "rectangle"
 
 
+# Parsed Size objects per size string; selections repeat the same few sizes
+size_cache = {}
+
+
+def get_size(size_str):
+    """Return a Size for size_str, parsing each distinct string once."""
+    size = size_cache.get(size_str)
+    if size is None:
+        size = Size(size_str)
+        size_cache[size_str] = size
+    return size
+
+
 if __name__ == "__main__":
     # Quick sanity examples
     for sample in [
@@ -125,6 +125,11 @@ class RevitElement:
     # Selects many elements
     @classmethod
     def select_many(cls, uidoc, elements):
+        # Typed id lists are handed to Revit as-is
+        if isinstance(elements, List[ElementId]):
+            if elements.Count > 0:
+                uidoc.Selection.SetElementIds(elements)
+            return
         ids = List[ElementId]()
         for el in elements:
             if el is None:
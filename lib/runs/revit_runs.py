@@ -11,7 +11,7 @@ the copyright holder.
 # =========================================================
 from ducts.revit_xyz import RevitXYZ
 from ducts.revit_duct import RevitDuct
-from geometry.size import Size
+from geometry.size import get_size
 from geometry.offsets import Offsets
 from Autodesk.Revit.DB import (
     ElementId,
@@ -80,7 +80,7 @@ class RevitRuns(object):
         if not size_str:
             return None
 
-        size_obj = Size(size_str)
+        size_obj = get_size(size_str)
 
         # Round
         if size_obj.in_diameter is not None:
@@ -644,7 +644,7 @@ class RevitRuns(object):
             all_ducts_index = {}
 
         # Parse starting duct shape and size using Size.in_shape()
-        start_size_obj = Size(str(start_duct.size))
+        start_size_obj = get_size(str(start_duct.size))
 
         def shape_key_from_size(size_obj):
             """Create a comparable key from Size using inlet fields only."""
@@ -685,6 +685,9 @@ class RevitRuns(object):
 
         start_shape = shape_key_from_size(start_size_obj)
 
+        # Shape keys of fallback candidates, parsed at most once per part
+        index_shapes = {}
+
         def connectors_close(duct_a, duct_b, tol=1e-4):
             """Fallback: check if any connectors from two ducts are coincident within tolerance (feet)."""
             try:
@@ -739,12 +742,15 @@ class RevitRuns(object):
                                 doc, view, connected_elem)
                         except Exception:
                             continue
+                        # Skip visited parts before reading their size
+                        if connected_duct.id in visited:
+                            continue
                         # Parse connected duct shape and size via Size.in_shape()
-                        connected_size_obj = Size(str(connected_duct.size))
+                        connected_size_obj = get_size(str(connected_duct.size))
                         connected_shape = shape_key_from_size(
                             connected_size_obj)
                         # Match by normalized shape/size only (avoid string formatting mismatches)
-                        if shape_equals(connected_shape, start_shape) and connected_duct.id not in visited:
+                        if shape_equals(connected_shape, start_shape):
                             to_visit.append(connected_duct)
                 # Fallback: if no owner references provided by API, try proximity to other parts
                 if all_ducts_index:
@@ -752,10 +758,14 @@ class RevitRuns(object):
                         if other_id == duct.id or other_id in visited:
                             continue
                         # Pre-filter by shape/size to limit work
-                        try:
-                            other_shape = shape_key_from_size(
-                                Size(str(other_duct.size)))
-                        except Exception:
+                        if other_id not in index_shapes:
+                            try:
+                                index_shapes[other_id] = shape_key_from_size(
+                                    get_size(str(other_duct.size)))
+                            except Exception:
+                                index_shapes[other_id] = None
+                        other_shape = index_shapes[other_id]
+                        if other_shape is None:
                             continue
                         if not shape_equals(other_shape, start_shape):
                             continue
@@ -769,7 +779,7 @@ class RevitRuns(object):
         run = set()
         to_visit = [start_duct]
         visited = set()
-        start_size_obj = Size(str(start_duct.size))
+        start_size_obj = get_size(str(start_duct.size))
 
         def shape_key_from_size(size_obj):
             """Create a comparable key from Size using inlet fields only."""
@@ -835,7 +845,7 @@ class RevitRuns(object):
                             continue
 
                         # Parse connected duct shape and size
-                        connected_size_obj = Size(str(connected_duct.size))
+                        connected_size_obj = get_size(str(connected_duct.size))
                         connected_shape = shape_key_from_size(
                             connected_size_obj)
 
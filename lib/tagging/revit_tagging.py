@@ -30,13 +30,12 @@ uidoc = __revit__.ActiveUIDocument  # type: UIDocument
 
 # Functions
 # =======================================================================
-def get_revit_year(app):
-    """Extract Revit year from Application.VersionName."""
-    name = app.VersionName
-    for n in name.split():
-        if n.isdigit():
-            return int(n)
-    return None
+def element_id_value(element_id):
+    """Return the integer value of an ElementId on Revit 2026+ and earlier."""
+    value = getattr(element_id, "Value", None)
+    if value is None:
+        value = getattr(element_id, "IntegerValue", None)
+    return int(value) if value is not None else None
 
 
 # Classes
@@ -97,6 +96,8 @@ class RevitTagging:
                 self.tag_syms.append(symbol)
                 if symbol_id is not None:
                     seen_ids.add(symbol_id)
+        # Resolved get_label lookups, keyed by lowercased search text
+        self._label_cache = {}
 
     @staticmethod
     def _get_type_param_text(symbol, param_name):
@@ -149,10 +150,13 @@ class RevitTagging:
         if not name_contains:
             raise ValueError("name_contains must be a non-empty string")
         needle = name_contains.lower()
+        if needle in self._label_cache:
+            return self._label_cache[needle]
         for ts in self.tag_syms:
             _, _, pool = self._tag_pool(ts)
             pool = pool.lower()
             if needle in pool:
+                self._label_cache[needle] = ts
                 return ts
         raise LookupError("No label found with: " + name_contains)
 
@@ -268,50 +272,22 @@ class RevitTagging:
     def already_tagged(self,
                        elem,
                        tag_fam_name):
+        """Return True if elem already has a tag of tag_fam_name in this view.
+
+        Only the element's dependent tags are checked, instead of every tag
+        in the view.
+        """
         if elem is None:
             return False
 
-        tags = list(
-            FilteredElementCollector(self.doc, self.view.Id)
-            .OfClass(IndependentTag)
-            .ToElements()
-        )
-
-        revit_year = get_revit_year(app)
-
-        for itag in tags:
-            try:
-                tagged_elem_id = None
+        if isinstance(tag_fam_name, str):
+            tname = tag_fam_name.strip().lower()
+        else:
+            tname = str(tag_fam_name).strip().lower()
 
-                # Revit 2026+ uses GetTaggedLocalElementIds() method
-                if revit_year and revit_year >= 2026:
-                    tagged_elem_ids = itag.GetTaggedLocalElementIds()
-                    if not tagged_elem_ids:
-                        continue
-                    # Check if any of the tagged element IDs match our element
-                    for tid in tagged_elem_ids:
-                        if tid == elem.Id:
-                            tagged_elem_id = tid
-                            break
-                # Revit 2022-2025 uses TaggedLocalElementId property
-                else:
-                    tagged_elem_id = itag.TaggedLocalElementId
-
-                if tagged_elem_id and tagged_elem_id == elem.Id:
-                    # Get the tag's FamilySymbol to check family name
-                    tag_type_id = itag.GetTypeId()
-                    tag_type = self.doc.GetElement(tag_type_id)
-                    if tag_type and hasattr(tag_type, 'Family'):
-                        famname = (tag_type.Family.Name or "").strip().lower()
-                        if isinstance(tag_fam_name, str):
-                            tname = tag_fam_name.strip().lower()
-                        else:
-                            tname = str(tag_fam_name).strip().lower()
-                        if famname == tname:
-                            return True
-            except Exception:
-                continue
-        return False
+        key = element_id_value(elem.Id)
+        existing = self.build_existing_tag_family_map([elem])
+        return tname in existing.get(key, ())
 
     def place_tag(self,
                   element_or_ref,
@@ -704,8 +680,9 @@ class RevitTagging:
                         for tid in tagged_ids:
                             if not tid:
                                 continue
-                            key = tid.IntegerValue if hasattr(
-                                tid, "IntegerValue") else int(tid)
+                            key = element_id_value(tid)
+                            if key is None:
+                                continue
                             if key not in result:
                                 result[key] = set()
                             result[key].add(fam_name)
@@ -738,8 +715,9 @@ class RevitTagging:
                 for tid in tagged_ids:
                     if not tid:
                         continue
-                    key = tid.IntegerValue if hasattr(
-                        tid, "IntegerValue") else int(tid)
+                    key = element_id_value(tid)
+                    if key is None:
+                        continue
                     if key not in result:
                         result[key] = set()
                     result[key].add(fam_name)
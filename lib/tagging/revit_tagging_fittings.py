@@ -146,6 +146,8 @@ class Fittings:
         self.missing_tag_labels = set()
         self._slot_resolution_cache = {}
         self._slot_by_tag_id = {}
+        self._tag_pool_text_cache = {}
+        self._connector_dz_cache = {}
 
         # Pre-normalize rule sets once.
         self._norm_elbow_fam = {self._norm(x) for x in self.elbow_families}
@@ -153,10 +155,15 @@ class Fittings:
             x) for x in self.square_elbow_families}
         self._norm_angle_skip_fam = {self._norm(
             x) for x in self.family_to_angle_skip}
+        self._norm_skip_parameters = {
+            param: frozenset(v.strip().lower() for v in values)
+            for param, values in self.skip_parameters.items()
+        }
 
         # Build extension/degree tag sets from resolved slot candidates.
         _ext_slots = (self.SLOT_EXT_BOT, self.SLOT_EXT_TOP,
                       self.SLOT_EXT_LEFT, self.SLOT_EXT_RIGHT)
+        self._ext_slots = frozenset(_ext_slots)
         self._norm_ext_tags_by_slot = {
             slot: {
                 self._candidate_pool_needle(name)
@@ -469,19 +476,21 @@ class Fittings:
     # ------------------------------------------------------------------
 
     def _tag_pool_text(self, tag):
-        fam_name, sym_name = self._tag_symbol_parts(tag)
-        fam_name = fam_name.lower()
-        sym_name = sym_name.lower()
-        return (fam_name + " " + sym_name).strip()
+        """Return the lowercased 'family type' text for tag, cached per tag type."""
+        tag_id = self._as_int_id(getattr(tag, 'Id', None))
+        pool = self._tag_pool_text_cache.get(tag_id)
+        if pool is None:
+            fam_name, sym_name = self._tag_symbol_parts(tag)
+            fam_name = fam_name.lower()
+            sym_name = sym_name.lower()
+            pool = (fam_name + " " + sym_name).strip()
+            if tag_id is not None:
+                self._tag_pool_text_cache[tag_id] = pool
+        return pool
 
     def _is_extension_tag(self, tag):
         slot_name = self._slot_name_for_tag(tag)
-        if slot_name in {
-            self.SLOT_EXT_BOT,
-            self.SLOT_EXT_TOP,
-            self.SLOT_EXT_LEFT,
-            self.SLOT_EXT_RIGHT,
-        }:
+        if slot_name in self._ext_slots:
             return True
 
         pool = self._tag_pool_text(tag)
@@ -503,12 +512,7 @@ class Fittings:
 
     def _extension_tag_slot(self, tag):
         slot_name = self._slot_name_for_tag(tag)
-        if slot_name in {
-            self.SLOT_EXT_BOT,
-            self.SLOT_EXT_TOP,
-            self.SLOT_EXT_LEFT,
-            self.SLOT_EXT_RIGHT,
-        }:
+        if slot_name in self._ext_slots:
             return slot_name
 
         pool = self._tag_pool_text(tag)
@@ -580,57 +584,82 @@ class Fittings:
                 return True
         return False
 
-    @staticmethod
-    def _connector_dz(element):
+    def _connector_dz(self, element):
         """Return vertical distance between the two furthest connectors (feet)."""
+        element_id = self._as_int_id(getattr(element, 'Id', None))
+        dz = self._connector_dz_cache.get(element_id)
+        if dz is not None:
+            return dz
+        dz = 0.0
         try:
             origins = RevitXYZ(element).connector_origins()
             if origins and len(origins) >= 2:
-                return abs(origins[1].Z - origins[0].Z)
+                dz = abs(origins[1].Z - origins[0].Z)
         except Exception:
             pass
-        return 0.0
+        if element_id is not None:
+            self._connector_dz_cache[element_id] = dz
+        return dz
 
     def should_skip_by_param(self, duct):
-        for param, skip_values in self.skip_parameters.items():
+        # Wrappers are built at most once per duct, only when a parameter
+        # is not available as a duct attribute.
+        element_wrapper = None
+        type_wrapper = None
+        type_checked = False
+        for param, skip_values in self._norm_skip_parameters.items():
             param_val = getattr(duct, param, None)
             if not param_val:
-                param_candidates = [param, param.title(), param.upper()]
+                param_candidates = [param]
+                for candidate in (param.title(), param.upper()):
+                    if candidate not in param_candidates:
+                        param_candidates.append(candidate)
                 param_val = None
+                if element_wrapper is None:
+                    element_wrapper = RevitElement(
+                        self.doc, self.view, duct.element)
                 for candidate in param_candidates:
                     try:
-                        param_val = RevitElement(
-                            self.doc, self.view, duct.element).get_param(candidate)
+                        param_val = element_wrapper.get_param(candidate)
                     except Exception:
                         param_val = None
                     if param_val is not None:
                         break
                 if param_val is None:
-                    try:
-                        type_element = self.doc.GetElement(
-                            duct.element.GetTypeId())
-                    except Exception:
-                        type_element = None
-                    if type_element is not None:
+                    if not type_checked:
+                        type_checked = True
+                        try:
+                            type_element = self.doc.GetElement(
+                                duct.element.GetTypeId())
+                        except Exception:
+                            type_element = None
+                        if type_element is not None:
+                            type_wrapper = RevitElement(
+                                self.doc, self.view, type_element)
+                    if type_wrapper is not None:
                         for candidate in param_candidates:
                             try:
-                                param_val = RevitElement(
-                                    self.doc, self.view, type_element).get_param(candidate)
+                                param_val = type_wrapper.get_param(candidate)
                             except Exception:
                                 param_val = None
                             if param_val is not None:
                                 break
             if param_val is None:
                 continue
-            if str(param_val).strip().lower() in [v.strip().lower() for v in skip_values]:
+            if str(param_val).strip().lower() in skip_values:
                 return True
         return False
 
-    def skip_tag_reason(self, duct, tag):
+    def skip_tag_reason(self, duct, tag, fam=None):
+        """Return why tag should be skipped on duct, or None.
+
+        fam is the duct's normalized family name, when the caller has it.
+        """
         if self.should_skip_by_param(duct):
             return 'Skipped by parameter rule'
 
-        fam = self._norm(duct.family)
+        if fam is None:
+            fam = self._norm(duct.family)
         slot_name = self._slot_name_for_tag(tag)
 
         # Never place degree tags on 45° or 90° fittings.
@@ -650,8 +679,8 @@ class Fittings:
 
         return None
 
-    def should_skip_tag(self, duct, tag):
-        return self.skip_tag_reason(duct, tag) is not None
+    def should_skip_tag(self, duct, tag, fam=None):
+        return self.skip_tag_reason(duct, tag, fam) is not None
 
     @staticmethod
     def _as_int_id(revit_id_like):
@@ -772,7 +801,7 @@ class Fittings:
 
         return removed
 
-    def delete_skipped_tags_for_element(self, duct, tag_configs):
+    def delete_skipped_tags_for_element(self, duct, tag_configs, fam=None):
         """Delete existing tags that now violate skip rules for this duct."""
         if duct is None or not tag_configs:
             return 0
@@ -786,11 +815,13 @@ class Fittings:
             tag_type_ids.discard(None)
             return self.delete_tag_type_ids_for_element(duct.element, tag_type_ids)
 
+        if fam is None:
+            fam = self._norm(duct.family)
         tag_type_ids = set()
         for tag, _ in tag_configs:
             if tag is None:
                 continue
-            if self.should_skip_tag(duct, tag):
+            if self.should_skip_tag(duct, tag, fam):
                 tag_type_id = self._as_int_id(getattr(tag, 'Id', None))
                 if tag_type_id is not None:
                     tag_type_ids.add(tag_type_id)